@@ -235,6 +235,54 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+-- Function returning the planner's row estimate for a table, used for cheap
+-- statistics instead of exact COUNT(*) scans (-1 before the first ANALYZE)
+CREATE OR REPLACE FUNCTION estimate_count(tbl TEXT)
+RETURNS BIGINT AS $$
+    SELECT reltuples::BIGINT FROM pg_class WHERE oid = to_regclass(tbl);
+$$ LANGUAGE sql STABLE;
+
+-- Row estimates for all the tables reported in statistics, in one call
+CREATE OR REPLACE FUNCTION logger_stats(messages_table TEXT, actions_table TEXT, chats_table TEXT)
+RETURNS TABLE(messages BIGINT, actions BIGINT, chats BIGINT) AS $$
+    SELECT estimate_count(messages_table), estimate_count(actions_table), estimate_count(chats_table);
+$$ LANGUAGE sql STABLE;
+
+-- Function deleting up to batch_size rows older than cutoff, so retention
+-- cleanup runs as a series of short statements instead of one long delete.
+-- lock_timeout keeps a batch from queueing behind writers indefinitely.
+-- Only the logger's retention tables and their time columns are accepted
+CREATE OR REPLACE FUNCTION cleanup_batch(tbl TEXT, time_column TEXT, cutoff TIMESTAMPTZ, batch_size INTEGER)
+RETURNS INTEGER AS $$
+DECLARE
+    deleted INTEGER;
+BEGIN
+    IF (tbl, time_column) NOT IN (('telegram_messages', 'date'), ('telegram_actions', 'occurred_at')) THEN
+        RAISE EXCEPTION 'cleanup_batch does not accept %.%', tbl, time_column
+            USING ERRCODE = 'insufficient_privilege';
+    END IF;
+    
+    SET LOCAL lock_timeout = '5s';
+    EXECUTE format(
+        'DELETE FROM %I WHERE ctid = ANY(ARRAY(SELECT ctid FROM %I WHERE %I < $1 LIMIT $2))',
+        tbl, tbl, time_column
+    ) USING cutoff, batch_size;
+    GET DIAGNOSTICS deleted = ROW_COUNT;
+    RETURN deleted;
+END;
+$$ LANGUAGE plpgsql;
+
+-- PostgREST exposes every function, so keep bulk deletes away from public API
+-- keys; the bot falls back to a plain filtered delete when it cannot call this
+REVOKE EXECUTE ON FUNCTION cleanup_batch(TEXT, TEXT, TIMESTAMPTZ, INTEGER) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION cleanup_batch(TEXT, TEXT, TIMESTAMPTZ, INTEGER) TO service_role;
+
+-- Function used by health checks to prove connectivity without reading table rows
+CREATE OR REPLACE FUNCTION health_ping()
+RETURNS TIMESTAMPTZ AS $$
+    SELECT now();
+$$ LANGUAGE sql STABLE;
+
 -- Triggers to automatically update updated_at columns
 CREATE OR REPLACE TRIGGER update_telegram_checkpoints_updated_at
     BEFORE UPDATE ON telegram_checkpoints
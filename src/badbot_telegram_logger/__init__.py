@@ -10,10 +10,33 @@ __version__ = "0.1.0"
 __author__ = "BadBot Team"
 __description__ = "Telegram message and action logging bot"
 
+from typing import TYPE_CHECKING, Any
+
 from .config import Config, load_config, get_config
 from .models import ActionType, MessageType
-from .database import SupabaseManager, DatabaseError
-from .bot import TelegramLogger
+
+if TYPE_CHECKING:
+    from .database import SupabaseManager, DatabaseError
+    from .bot import TelegramLogger
+
+# Exports backed by the Telegram/Supabase client stacks, imported on first access
+_LAZY_EXPORTS = {
+    "SupabaseManager": ".database",
+    "DatabaseError": ".database",
+    "TelegramLogger": ".bot",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import heavy exports on first access so importing the config stays cheap."""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    from importlib import import_module
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
 __all__ = [
     "Config",
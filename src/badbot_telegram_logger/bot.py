@@ -9,18 +9,59 @@ import asyncio
 import signal
 import sys
 import os
+import time
 from datetime import datetime, timezone, timedelta
-from typing import Any, Dict, List, Optional, Set, Tuple
-from collections import deque
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+from collections import OrderedDict, deque
 import gc
 
+import aiohttp
+from aiohttp import web
 from telegram import Update, Message, Chat, User
 from telegram.ext import Application, MessageHandler, filters, ContextTypes
 from loguru import logger
 
 from .config import Config, get_config
 from .database import SupabaseManager, DatabaseError
-from .models import ActionType
+from .models import ActionType, QueuedAction
+
+try:
+    import orjson
+except ImportError:
+    # Fall back to aiohttp's stdlib JSON encoding if orjson not available
+    orjson = None
+
+# Profile photo lookups (two Bot API calls each) allowed in flight at once
+_AVATAR_FETCH_CONCURRENCY = 5
+
+# Whether the process-wide garbage collector settings have been applied
+_gc_tuned = False
+
+
+def _parse_chat_ids(values: Iterable[str]) -> FrozenSet[int]:
+    """Parse configured chat IDs into integers, skipping invalid entries."""
+    chat_ids = set()
+    for value in values:
+        try:
+            chat_ids.add(int(value))
+        except ValueError:
+            logger.warning(f"Ignoring invalid chat ID in configuration: {value!r}")
+    return frozenset(chat_ids)
+
+
+def _tune_gc() -> None:
+    """
+    Make young-generation collections cheaper and less frequent, and move the
+    long-lived startup objects out of the generational scans entirely.
+    
+    The settings are process-wide, so they are applied at most once.
+    """
+    global _gc_tuned
+    if _gc_tuned:
+        return
+    _gc_tuned = True
+    gc.set_threshold(50_000, 10, 10)
+    gc.freeze()
 
 
 class TelegramLogger:
@@ -45,21 +86,73 @@ class TelegramLogger:
         
         # Initialize components
         self.db_manager = SupabaseManager(self.config)
+        self.http_session: Optional[aiohttp.ClientSession] = None
         
         # Queues for batch processing
         self.message_queue: deque = deque(maxlen=self.config.max_queue_size)
         self.action_queue: deque = deque(maxlen=self.config.max_queue_size)
         
-        # Tracking sets for processed items with size limits
-        self.processed_messages: Set[str] = set()
-        self.processed_actions: Set[str] = set()
-        self._max_tracked_items = 100000  # Maximum items to track
-        self._cleanup_threshold = 50000   # Clean up to this many items
+        # Chat/channel filters snapshotted once for O(1) checks per message;
+        # None means no allowlist is configured
+        self._allowed_chats: Optional[FrozenSet[int]] = (
+            _parse_chat_ids(self.config.allowed_chats) if self.config.allowed_chats else None
+        )
+        self._ignored_chats = _parse_chat_ids(self.config.ignored_chats)
+        self._allowed_channels: Optional[FrozenSet[str]] = (
+            frozenset(name.lower() for name in self.config.allowed_channels)
+            if self.config.allowed_channels else None
+        )
+        self._ignored_channels = frozenset(name.lower() for name in self.config.ignored_channels)
+        
+        # Adaptive flush thresholds: grow under sustained load, shrink when idle
+        self._current_batch_threshold = self.config.batch_size
+        self._current_action_batch_threshold = self.config.batch_size
+        
+        # Chat/user info coalescing: entities written recently are skipped and
+        # pending upserts are keyed by ID so repeats collapse into one write
+        self._max_seen_entities = 100000  # Maximum chats/users remembered per cache
+        self._info_ttl = 300  # Seconds before the same chat/user is written again
+        self._seen_chats: OrderedDict[int, float] = OrderedDict()
+        self._seen_users: OrderedDict[int, float] = OrderedDict()
+        self._pending_chat_upserts: Dict[int, Chat] = {}
+        self._pending_user_upserts: Dict[int, User] = {}
+        self._info_flush_task: Optional[asyncio.Task] = None
+        self._info_flush_stop = asyncio.Event()
+        self._avatar_fetch_slots = asyncio.Semaphore(_AVATAR_FETCH_CONCURRENCY)
+        
+        # Dedicated message writer so handlers never wait on Supabase; on shutdown
+        # it is asked to stop so an in-flight batch is never cancelled mid-store
+        self._message_flush_event = asyncio.Event()
+        self._writer_task: Optional[asyncio.Task] = None
+        self._writer_stopping = False
+        
+        # Health check server; /health results are cached briefly and refreshes
+        # are serialized so concurrent probes share one database check
+        self._health_runner: Optional[web.AppRunner] = None
+        self._health_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        self._health_lock = asyncio.Lock()
+        
+        # Shutdown coordination
+        self._shutdown_event = asyncio.Event()
+        self._closed = False
+        self._next_cleanup_ts: Optional[float] = None
         
         # Backfill tracking
         self.backfill_in_progress: Dict[str, bool] = {}
         self.backfill_tasks: Dict[str, asyncio.Task] = {}
         
+        # Process handle for memory sampling (psutil is optional)
+        try:
+            import psutil
+            self._process = psutil.Process(os.getpid())
+        except ImportError:
+            self._process = None
+        self._stats_ticks = 0
+        
+        # Wall-clock time refreshed once per background tick, monotonic start for uptime
+        self._now_cache: Optional[datetime] = None
+        self._start_monotonic = time.monotonic()
+        
         # Statistics
         self.stats = {
             "messages_processed": 0,
@@ -80,14 +173,14 @@ class TelegramLogger:
         
         # Register event handlers
         self._register_event_handlers()
-        
-        # Setup signal handlers for graceful shutdown
-        self._setup_signal_handlers()
     
     def _setup_logging(self) -> None:
         """Setup logging configuration."""
         log_level = self.config.log_level.upper()
         
+        # Cached so hot paths can skip debug logging without calling into loguru
+        self._debug = log_level == "DEBUG"
+        
         # Remove default logger
         logger.remove()
         
@@ -123,24 +216,32 @@ class TelegramLogger:
     
     async def _handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle new messages."""
-        logger.debug(f"_handle_message entered for update: {update.update_id}")
-        if not update.message:
-            logger.debug(f"Update {update.update_id}: No message object found in update.")
-            return
-        
+        debug = self._debug
+        if debug:
+            logger.debug("_handle_message entered for update: {}", update.update_id)
         message = update.message
+        if not message:
+            if debug:
+                logger.debug("Update {}: No message object found in update.", update.update_id)
+            return
         
-        log_prefix = f"Message {message.message_id} from chat {message.chat.id}"
-        sender_info = f"user {message.from_user.id}" if message.from_user else "unknown user"
-        logger.debug(f"{log_prefix}: Received message from {sender_info}. Text: {message.text[:50] + '...' if message.text else '[No Text]'}")
+        message_id = message.message_id
+        chat_id = message.chat.id
+        if debug:
+            user = message.from_user
+            sender_info = f"user {user.id}" if user else "unknown user"
+            text_preview = message.text[:50] + '...' if message.text else '[No Text]'
+            logger.debug(f"Message {message_id} from chat {chat_id}: Received message from {sender_info}. Text: {text_preview}")
         
         if not await self._should_process_message(message):
-            logger.debug(f"{log_prefix}: Message skipped due to processing rules.")
+            if debug:
+                logger.debug("Message {} from chat {}: Message skipped due to processing rules.", message_id, chat_id)
             return
         
-        logger.debug(f"{log_prefix}: Message passed processing rules. Queuing for storage.")
+        if debug:
+            logger.debug("Message {} from chat {}: Message passed processing rules. Queuing for storage.", message_id, chat_id)
         # Add to processing queue
-        await self._queue_message(message)
+        self._queue_message(message)
         
         # Store chat and user info
         await self._store_chat_and_user_info(message)
@@ -151,13 +252,31 @@ class TelegramLogger:
         self.stats["errors"] += 1
     
     def _setup_signal_handlers(self) -> None:
-        """Setup signal handlers for graceful shutdown."""
-        def signal_handler(signum, frame):
-            logger.info(f"Received signal {signum}, shutting down gracefully...")
-            asyncio.create_task(self.close())
-        
-        signal.signal(signal.SIGINT, signal_handler)
-        signal.signal(signal.SIGTERM, signal_handler)
+        """Setup signal handlers for graceful shutdown on the running event loop."""
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self._request_shutdown, sig)
+            except NotImplementedError:
+                # Signal handlers are not supported on this platform's event loop
+                pass
+    
+    def _remove_signal_handlers(self) -> None:
+        """Restore default signal handling so a second signal can force exit."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.remove_signal_handler(sig)
+            except NotImplementedError:
+                pass
+    
+    def _request_shutdown(self, sig: signal.Signals) -> None:
+        """Wake up the main loop so it can shut down gracefully."""
+        logger.info(f"Received signal {sig.name}, shutting down gracefully...")
+        self._shutdown_event.set()
     
     async def _should_process_message(self, message: Message) -> bool:
         """
@@ -169,57 +288,65 @@ class TelegramLogger:
         Returns:
             True if message should be processed, False otherwise
         """
-        log_prefix = f"Message {message.message_id} from chat {message.chat.id}"
-
         # Skip if message is None
         if not message:
-            logger.debug(f"{log_prefix}: Skipped - message object is None.")
+            logger.debug("Skipped - message object is None.")
             return False
         
-        # Skip if message ID already processed
-        message_key = f"{message.chat.id}_{message.message_id}"
-        if message_key in self.processed_messages:
-            logger.debug(f"{log_prefix}: Skipped - message ID already processed.")
-            return False
+        chat = message.chat
+        chat_id = chat.id
+        chat_type = chat.type
+        message_id = message.message_id
+        user = message.from_user
         
         # Check if we should process bot messages
-        if message.from_user and message.from_user.is_bot and not self.config.process_bot_messages:
-            logger.debug(f"{log_prefix}: Skipped - message from bot and process_bot_messages is False.")
+        if user and user.is_bot and not self.config.process_bot_messages:
+            logger.debug("Message {} from chat {}: Skipped - message from bot and process_bot_messages is False.", message_id, chat_id)
             return False
         
         # Check if we should process channel messages
-        if message.chat.type == "channel" and not self.config.process_channel_messages:
-            logger.debug(f"{log_prefix}: Skipped - message from channel and process_channel_messages is False.")
+        is_channel = chat_type == "channel"
+        if is_channel and not self.config.process_channel_messages:
+            logger.debug("Message {} from chat {}: Skipped - message from channel and process_channel_messages is False.", message_id, chat_id)
             return False
         
         # Check chat filtering
-        if not self.config.should_process_chat(str(message.chat.id)):
-            logger.debug(f"{log_prefix}: Skipped - chat {message.chat.id} is not allowed or is ignored.")
+        if chat_id in self._ignored_chats or (
+            self._allowed_chats is not None and chat_id not in self._allowed_chats
+        ):
+            logger.debug("Message {} from chat {}: Skipped - chat {} is not allowed or is ignored.", message_id, chat_id, chat_id)
             return False
         
         # Check channel filtering for channels
-        if message.chat.type == "channel" and message.chat.username:
-            if not self.config.should_process_channel(message.chat.username):
-                logger.debug(f"{log_prefix}: Skipped - channel {message.chat.username} is not allowed or is ignored.")
+        if is_channel and chat.username:
+            channel_name = chat.username.lower()
+            if channel_name in self._ignored_channels or (
+                self._allowed_channels is not None and channel_name not in self._allowed_channels
+            ):
+                logger.debug("Message {} from chat {}: Skipped - channel {} is not allowed or is ignored.", message_id, chat_id, chat.username)
                 return False
         
-        logger.debug(f"{log_prefix}: Passed all processing checks.")
+        if self._debug:
+            logger.debug("Message {} from chat {}: Passed all processing checks.", message_id, chat_id)
         return True
     
-    async def _queue_message(self, message: Message) -> None:
+    def _queue_message(self, message: Message) -> None:
         """
-        Add a message to the processing queue.
+        Add a message to the processing queue without waiting on the database.
         
         Args:
             message: Telegram message to queue
         """
+        if len(self.message_queue) >= self.config.max_queue_size:
+            logger.warning(f"Message queue full, dropping message {message.message_id} from chat {message.chat.id}")
+            self.stats["errors"] += 1
+            return
+        
         self.message_queue.append(message)
-        message_key = f"{message.chat.id}_{message.message_id}"
-        self.processed_messages.add(message_key)
         
-        # Process immediately if queue is full
-        if len(self.message_queue) >= self.config.batch_size:
-            await self._process_message_queue()
+        # Wake the writer as soon as a full batch is ready
+        if len(self.message_queue) >= self._current_batch_threshold:
+            self._message_flush_event.set()
     
     async def _queue_action(
         self,
@@ -253,61 +380,127 @@ class TelegramLogger:
             before_data: State before the action
             after_data: State after the action
         """
-        action = {
-            "action_type": action_type,
-            "chat_id": chat_id,
-            "user_id": user_id,
-            "username": username,
-            "first_name": first_name,
-            "last_name": last_name,
-            "target_id": target_id,
-            "target_type": target_type,
-            "target_name": target_name,
-            "action_data": action_data,
-            "before_data": before_data,
-            "after_data": after_data
-        }
-        
-        self.action_queue.append(action)
+        self.action_queue.append(QueuedAction(
+            action_type,
+            chat_id,
+            user_id,
+            username,
+            first_name,
+            last_name,
+            target_id,
+            target_type,
+            target_name,
+            action_data,
+            before_data,
+            after_data
+        ))
         
         # Process immediately if queue is full
-        if len(self.action_queue) >= self.config.batch_size:
+        if len(self.action_queue) >= self._current_action_batch_threshold:
             await self._process_action_queue()
     
-    async def _process_message_queue(self) -> None:
-        """Process all messages in the queue."""
+    async def _message_writer_loop(self) -> None:
+        """Write queued messages whenever a batch fills up or the flush interval elapses."""
+        while self.application.running and not self._writer_stopping:
+            try:
+                await asyncio.wait_for(
+                    self._message_flush_event.wait(),
+                    timeout=self.config.flush_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._message_flush_event.clear()
+            
+            # close() drains whatever is still queued once the writer has exited
+            if self._writer_stopping:
+                break
+            
+            try:
+                await self._process_message_queue()
+            except Exception as e:
+                logger.error(f"Error in message writer: {e}")
+            
+            # Keep draining without waiting if another full batch is already queued
+            if len(self.message_queue) >= self._current_batch_threshold:
+                self._message_flush_event.set()
+    
+    def _adapt_batch_threshold(self, threshold: int, drained: int) -> int:
+        """
+        Compute the next flush threshold from the size of the batch just drained.
+        
+        A full batch means producers are outpacing flushes, so the threshold doubles
+        (up to max_queue_size). A partial batch comes from the periodic flush during
+        low traffic, so the threshold halves (down to batch_size) to bound latency.
+        
+        Args:
+            threshold: Current flush threshold
+            drained: Number of items in the batch just drained
+            
+        Returns:
+            The new flush threshold
+        """
+        if drained >= threshold:
+            return min(threshold * 2, self.config.max_queue_size)
+        return max(threshold // 2, self.config.batch_size)
+    
+    async def _process_message_queue(self, drain_all: bool = False) -> None:
+        """
+        Process the next batch of messages in the queue.
+        
+        Args:
+            drain_all: Take the entire queue in one batch (used on shutdown)
+        """
         if not self.message_queue:
+            # An idle flush counts as an empty batch, so a raised threshold decays back
+            self._current_batch_threshold = self._adapt_batch_threshold(self._current_batch_threshold, 0)
             logger.debug("Message queue is empty. Nothing to process.")
             return
         
-        logger.debug(f"Processing message queue. Current size: {len(self.message_queue)}")
+        if self._debug:
+            logger.debug(f"Processing message queue. Current size: {len(self.message_queue)}")
         
         # Get messages from queue
-        messages = []
-        while self.message_queue and len(messages) < self.config.batch_size:
-            messages.append(self.message_queue.popleft())
+        if drain_all:
+            messages = list(self.message_queue)
+            self.message_queue.clear()
+        else:
+            take = min(self._current_batch_threshold, len(self.message_queue))
+            messages = [self.message_queue.popleft() for _ in range(take)]
+            self._current_batch_threshold = self._adapt_batch_threshold(
+                self._current_batch_threshold, len(messages)
+            )
         
         if not messages:
             logger.debug("No messages to process after dequeuing.")
             return
         
-        logger.debug(f"Attempting to store {len(messages)} messages in batch.")
+        if self._debug:
+            logger.debug(f"Attempting to store {len(messages)} messages in batch.")
         
         try:
             # Store messages in batch
             stored_count = await self.db_manager.store_messages_batch(messages)
             self.stats["messages_processed"] += stored_count
             
-            # Update checkpoints
+            # Update checkpoints once per chat with its latest message
+            latest: Dict[int, Tuple[int, datetime]] = {}
             for message in messages:
-                await self.db_manager.update_checkpoint(
+                current = latest.get(message.chat.id)
+                if current is None or message.message_id > current[0]:
+                    latest[message.chat.id] = (message.message_id, message.date)
+
+            await asyncio.gather(*[
+                self.db_manager.update_checkpoint(
                     "message",
-                    last_processed_id=str(message.message_id),
-                    last_processed_timestamp=message.date,
-                    chat_id=message.chat.id
+                    last_processed_id=str(message_id),
+                    last_processed_timestamp=message_date,
+                    chat_id=chat_id
                 )
+                for chat_id, (message_id, message_date) in latest.items()
+            ])
             
-            logger.debug(f"Processed {stored_count} messages from queue")
+            if self._debug:
+                logger.debug(f"Processed {stored_count} messages from queue")
             
         except Exception as e:
             logger.error(f"Failed to process message queue: {e}")
@@ -316,49 +509,131 @@ class TelegramLogger:
     async def _process_action_queue(self) -> None:
         """Process all actions in the queue."""
         if not self.action_queue:
+            self._current_action_batch_threshold = self._adapt_batch_threshold(
+                self._current_action_batch_threshold, 0
+            )
             return
         
-        # Process actions one by one (they're smaller than messages)
-        actions_processed = 0
-        while self.action_queue:
-            action = self.action_queue.popleft()
-            
-            try:
-                success = await self.db_manager.store_action(**action)
-                if success:
-                    actions_processed += 1
-                    
-            except Exception as e:
-                logger.error(f"Failed to store action: {e}")
-                self.stats["errors"] += 1
+        # Snapshot the queue and store it in a single batch
+        actions = list(self.action_queue)
+        self.action_queue.clear()
         
+        self._current_action_batch_threshold = self._adapt_batch_threshold(
+            self._current_action_batch_threshold, len(actions)
+        )
+
+        try:
+            actions_processed = await self.db_manager.store_actions_batch(actions)
+        except Exception as e:
+            logger.error(f"Failed to store action batch: {e}")
+            self.stats["errors"] += 1
+            return
+
+        if actions_processed < len(actions):
+            logger.warning(f"Dropped {len(actions) - actions_processed} actions that failed to store")
+            self.stats["errors"] += 1
+
         if actions_processed > 0:
             self.stats["actions_processed"] += actions_processed
-            logger.debug(f"Processed {actions_processed} actions from queue")
+            if self._debug:
+                logger.debug(f"Processed {actions_processed} actions from queue")
     
     async def _store_chat_and_user_info(self, message: Message) -> None:
-        """Store chat and user information."""
-        try:
-            # Store chat info
-            await self.db_manager.store_chat_info(message.chat)
+        """Queue chat and user information for the next coalesced write."""
+        now = time.monotonic()
+        
+        chat = message.chat
+        if self._mark_seen(self._seen_chats, chat.id, now):
+            self._pending_chat_upserts[chat.id] = chat
+        
+        user = message.from_user
+        if user and self._mark_seen(self._seen_users, user.id, now):
+            self._pending_user_upserts[user.id] = user
+    
+    def _mark_seen(self, seen: "OrderedDict[int, float]", entity_id: int, now: float) -> bool:
+        """
+        Mark an entity as seen unless it was already written within the TTL.
+        
+        Args:
+            seen: Mapping of entity ID to the monotonic time it was last queued
+            entity_id: Chat or user ID
+            now: Current monotonic time
             
-            # Store user info if available
-            if message.from_user:
-                avatar_url = await self._get_user_profile_photo_url(message.from_user.id)
-                await self.db_manager.store_user_info(message.from_user, avatar_url)
-                
+        Returns:
+            True if the entity should be written, False if it was seen recently
+        """
+        last_seen = seen.get(entity_id)
+        if last_seen is not None and now - last_seen < self._info_ttl:
+            return False
+        
+        seen[entity_id] = now
+        seen.move_to_end(entity_id)
+        if len(seen) > self._max_seen_entities:
+            seen.popitem(last=False)
+        return True
+    
+    async def _flush_chat_and_user_info(self) -> None:
+        """Write all pending chat and user upserts in batches."""
+        if not self._pending_chat_upserts and not self._pending_user_upserts:
+            return
+        
+        chats = list(self._pending_chat_upserts.values())
+        users = list(self._pending_user_upserts.values())
+        self._pending_chat_upserts = {}
+        self._pending_user_upserts = {}
+        
+        # Chats and users are independent, so write them concurrently
+        await asyncio.gather(self._flush_chats(chats), self._flush_users(users))
+    
+    async def _flush_chats(self, chats: List[Chat]) -> None:
+        """Write a batch of pending chats, forgetting them if the write fails."""
+        if not chats:
+            return
+        
+        try:
+            if not await self.db_manager.store_chats_batch(chats):
+                # Allow failed chats to be retried on their next message
+                for chat in chats:
+                    self._seen_chats.pop(chat.id, None)
         except Exception as e:
-            logger.error(f"Failed to store chat/user info: {e}")
+            logger.error(f"Failed to store chat info: {e}")
+    
+    async def _flush_users(self, users: List[User]) -> None:
+        """Write a batch of pending users with their avatars, forgetting them if the write fails."""
+        if not users:
+            return
+        
+        try:
+            avatar_urls = await asyncio.gather(*[
+                self._get_user_profile_photo_url(user.id) for user in users
+            ])
+            urls_by_id = {user.id: url for user, url in zip(users, avatar_urls)}
+            if not await self.db_manager.store_users_batch(users, urls_by_id):
+                for user in users:
+                    self._seen_users.pop(user.id, None)
+        except Exception as e:
+            logger.error(f"Failed to store user info: {e}")
+    
+    async def _info_flush_loop(self) -> None:
+        """Periodically flush coalesced chat and user upserts until close() asks it to stop."""
+        while self.application.running and not self._info_flush_stop.is_set():
+            try:
+                await asyncio.wait_for(self._info_flush_stop.wait(), timeout=self.config.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            await self._flush_chat_and_user_info()
 
     async def _get_user_profile_photo_url(self, user_id: int) -> Optional[str]:
         """Get the URL of a user's highest-resolution profile picture."""
         try:
-            profile_photos = await self.application.bot.get_user_profile_photos(user_id, limit=1)
-            if profile_photos and profile_photos.photos:
-                # The photos are returned in descending order of size
-                highest_res_photo = profile_photos.photos[0][-1]
-                file = await self.application.bot.get_file(highest_res_photo.file_id)
-                return file.file_path
+            # Bound concurrent lookups so a large user flush stays within Bot API rate limits
+            async with self._avatar_fetch_slots:
+                profile_photos = await self.application.bot.get_user_profile_photos(user_id, limit=1)
+                if profile_photos and profile_photos.photos:
+                    # The photos are returned in descending order of size
+                    highest_res_photo = profile_photos.photos[0][-1]
+                    file = await self.application.bot.get_file(highest_res_photo.file_id)
+                    return file.file_path
         except Exception as e:
             logger.error(f"Could not fetch profile photo for user {user_id}: {e}")
         return None
@@ -400,7 +675,7 @@ class TelegramLogger:
             # Determine cutoff date for backfill
             cutoff_date = None
             if self.config.backfill_max_age_days:
-                cutoff_date = datetime.now(timezone.utc) - timedelta(days=self.config.backfill_max_age_days)
+                cutoff_date = self._now() - timedelta(days=self.config.backfill_max_age_days)
             
             # Backfill messages using Telegram API
             total_processed = 0
@@ -418,44 +693,37 @@ class TelegramLogger:
                     if not messages:
                         break
                     
-                    # Process messages
+                    # Collect messages to store for this chunk
+                    to_store: List[Message] = []
                     for update in messages:
-                        if update.message and update.message.chat.id == chat_id:
+                        message = update.message
+                        if message and message.chat.id == chat_id:
                             # Check cutoff date
-                            if cutoff_date and update.message.date < cutoff_date:
-                                continue
-                            
-                            # Skip if we've already processed this message
-                            message_key = f"{update.message.chat.id}_{update.message.message_id}"
-                            if message_key in self.processed_messages:
+                            if cutoff_date and message.date < cutoff_date:
                                 continue
                             
                             # Check if we should process this message
-                            if not await self._should_process_message(update.message):
+                            if not await self._should_process_message(message):
                                 continue
                             
-                            # Store message as backfilled
-                            try:
-                                success = await self.db_manager.store_message(update.message, is_backfilled=True)
-                                if success:
-                                    total_processed += 1
-                                    self.processed_messages.add(message_key)
-                                    
-                                    # Update checkpoint periodically
-                                    if total_processed % self.config.backfill_chunk_size == 0:
-                                        await self.db_manager.update_checkpoint(
-                                            "backfill",
-                                            last_processed_id=str(update.message.message_id),
-                                            last_processed_timestamp=update.message.date,
-                                            chat_id=chat_id,
-                                            total_processed=total_processed
-                                        )
-                                        
-                                        # Delay to avoid rate limiting
-                                        await asyncio.sleep(self.config.backfill_delay_seconds)
-                                        
-                            except Exception as e:
-                                logger.error(f"Failed to store backfilled message {update.message.message_id}: {e}")
+                            to_store.append(message)
+                    
+                    # Store the chunk as backfilled in a single batch
+                    if to_store:
+                        stored = await self.db_manager.store_messages_batch(to_store, is_backfilled=True)
+                        if stored:
+                            total_processed += stored
+                            
+                            last_message = to_store[-1]
+                            await self.db_manager.update_checkpoint(
+                                "backfill",
+                                last_processed_id=str(last_message.message_id),
+                                last_processed_timestamp=last_message.date,
+                                chat_id=chat_id,
+                                total_processed=total_processed
+                            )
+                        else:
+                            logger.error(f"Failed to store {len(to_store)} backfilled messages for chat {chat_id}")
                     
                     # Update offset for next batch
                     if messages:
@@ -490,59 +758,131 @@ class TelegramLogger:
     async def cleanup_memory(self) -> None:
         """Clean up memory periodically."""
         try:
-            # Clean up tracked message/action sets if they get too large
-            if len(self.processed_messages) > self._max_tracked_items:
-                # Keep only the most recent items (approximate)
-                messages_list = list(self.processed_messages)
-                self.processed_messages = set(messages_list[-self._cleanup_threshold:])
-                logger.info(f"Cleaned up processed messages tracking: {len(messages_list)} -> {len(self.processed_messages)}")
-            
-            if len(self.processed_actions) > self._max_tracked_items:
-                actions_list = list(self.processed_actions)
-                self.processed_actions = set(actions_list[-self._cleanup_threshold:])
-                logger.info(f"Cleaned up processed actions tracking: {len(actions_list)} -> {len(self.processed_actions)}")
-            
-            # Force garbage collection
-            collected = gc.collect()
+            # Collect only the youngest generation; a full collection would
+            # pause the event loop while it walks the whole heap
+            collected = gc.collect(0)
             if collected > 0:
                 logger.debug(f"Garbage collector freed {collected} objects")
                 
         except Exception as e:
             logger.error(f"Error during memory cleanup: {e}")
     
+    def _now(self) -> datetime:
+        """Return the current UTC time cached for this background tick."""
+        return self._now_cache or datetime.now(timezone.utc)
+    
     async def update_stats(self) -> None:
         """Update bot statistics."""
         try:
-            import psutil
-            import os
-            
             # Update runtime stats
-            uptime = (datetime.now(timezone.utc) - self.stats["start_time"]).total_seconds()
-            self.stats["uptime_seconds"] = uptime
+            self.stats["uptime_seconds"] = time.monotonic() - self._start_monotonic
             
-            # Update memory usage
-            process = psutil.Process(os.getpid())
-            memory_mb = process.memory_info().rss / 1024 / 1024
-            self.stats["memory_usage_mb"] = round(memory_mb, 2)
+            # Sample memory usage every 10th update (~5 minutes)
+            if self._process and self._stats_ticks % 10 == 0:
+                self.stats["memory_usage_mb"] = self._process.memory_info().rss >> 20
+            self._stats_ticks += 1
             
             # Update queue sizes
             self.stats["queue_sizes"]["messages"] = len(self.message_queue)
             self.stats["queue_sizes"]["actions"] = len(self.action_queue)
             
-        except ImportError:
-            # psutil not available, skip memory stats
-            uptime = (datetime.now(timezone.utc) - self.stats["start_time"]).total_seconds()
-            self.stats["uptime_seconds"] = uptime
         except Exception as e:
             logger.error(f"Error updating stats: {e}")
     
     
     
+    async def get_health_status(self) -> Dict[str, Any]:
+        """Build the detailed health status, including a live database check."""
+        database_connected = await self.db_manager.health_check()
+        bot_running = self.application.running
+        return {
+            "status": "healthy" if database_connected and bot_running else "unhealthy",
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "bot_running": bot_running,
+            "database_connected": database_connected,
+            "uptime_seconds": self.stats["uptime_seconds"],
+            "queue_sizes": {
+                "messages": len(self.message_queue),
+                "actions": len(self.action_queue)
+            }
+        }
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Return a JSON-serializable snapshot of the bot statistics."""
+        return {
+            **self.stats,
+            "start_time": self.stats["start_time"].isoformat(),
+            "queue_sizes": {
+                "messages": len(self.message_queue),
+                "actions": len(self.action_queue)
+            }
+        }
+    
+    def _json_response(self, data: Dict[str, Any], status: int = 200) -> web.Response:
+        """Serialize a response body, using orjson when available."""
+        if orjson is not None:
+            return web.Response(body=orjson.dumps(data), status=status, content_type="application/json")
+        return web.json_response(data, status=status)
+    
+    async def _root_handler(self, request: web.Request) -> web.Response:
+        """Handle GET / with basic status information."""
+        return self._json_response({
+            "service": "badbot-telegram-logger",
+            "status": "running" if self.application.running else "stopped"
+        })
+    
+    async def _health_handler(self, request: web.Request) -> web.Response:
+        """Handle GET /health, reusing a recent result instead of pinging the database."""
+        loop = asyncio.get_running_loop()
+        ttl = self.config.health_cache_seconds
+        
+        cached = self._health_cache
+        if cached is None or loop.time() - cached[0] >= ttl:
+            async with self._health_lock:
+                # Another request may have refreshed the cache while we waited
+                cached = self._health_cache
+                if cached is None or loop.time() - cached[0] >= ttl:
+                    cached = (loop.time(), await self.get_health_status())
+                    self._health_cache = cached
+        
+        data = cached[1]
+        return self._json_response(data, status=200 if data["status"] == "healthy" else 503)
+    
+    async def _stats_handler(self, request: web.Request) -> web.Response:
+        """Handle GET /stats with bot statistics."""
+        return self._json_response(self.get_stats())
+    
+    async def _start_health_server(self) -> None:
+        """Start the health check HTTP server."""
+        app = web.Application()
+        app.router.add_get("/", self._root_handler)
+        app.router.add_get("/health", self._health_handler)
+        app.router.add_get("/stats", self._stats_handler)
+        
+        self._health_runner = web.AppRunner(app, access_log=None)
+        await self._health_runner.setup()
+        site = web.TCPSite(self._health_runner, "0.0.0.0", self.config.health_check_port)
+        await site.start()
+        logger.info(f"Health check server listening on port {self.config.health_check_port}")
+    
     async def start(self) -> None:
         """Start the bot."""
+        # Setup signal handlers for graceful shutdown as soon as the loop is running
+        self._setup_signal_handlers()
+        
         try:
+            # Shared HTTP session with pooled keep-alive connections and DNS caching
+            self.http_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=100,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=60,
+                    enable_cleanup_closed=True
+                )
+            )
+            
             # Initialize database
-            await self.db_manager.initialize()
+            await self.db_manager.initialize(self.http_session)
             logger.info("Database initialized successfully")
             
             # Initialize and start the bot first
@@ -553,8 +893,14 @@ class TelegramLogger:
             # Start background tasks after bot is initialized
             logger.debug("Creating background tasks...")
             asyncio.create_task(self._background_tasks())
+            self._info_flush_task = asyncio.create_task(self._info_flush_loop())
+            self._writer_task = asyncio.create_task(self._message_writer_loop())
             
             
+            # Start health check server
+            if self.config.health_check_enabled:
+                await self._start_health_server()
+            
             # Start backfill if enabled
             if self.config.backfill_enabled and self.config.backfill_on_startup:
                 logger.info("Starting backfill process...")
@@ -563,12 +909,15 @@ class TelegramLogger:
             # Start polling
             await self.application.updater.start_polling()
             
+            # Everything allocated during startup lives for the whole run
+            _tune_gc()
+            
             logger.info("Bot started successfully")
             
             # Keep the bot running
             try:
-                # This will keep the bot running indefinitely
-                await asyncio.Event().wait()
+                # Wait until a signal or close() requests shutdown
+                await self._shutdown_event.wait()
             except (KeyboardInterrupt, asyncio.CancelledError):
                 logger.info("Received shutdown signal")
             finally:
@@ -581,18 +930,22 @@ class TelegramLogger:
     
     async def _background_tasks(self) -> None:
         """Run background tasks."""
+        loop = asyncio.get_running_loop()
+        self._next_cleanup_ts = loop.time() + 600
+        
         while self.application.running:
             try:
+                self._now_cache = datetime.now(timezone.utc)
                 logger.debug("Running background tasks...")
-                # Process queues
-                await self._process_message_queue()
+                # Process queues (messages are written by the writer task)
                 await self._process_action_queue()
                 
                 # Update stats
                 await self.update_stats()
                 
                 # Cleanup memory every 10 minutes
-                if self.stats["uptime_seconds"] % 600 < 30:  # Every ~10 minutes
+                if loop.time() >= self._next_cleanup_ts:
+                    self._next_cleanup_ts = loop.time() + 600
                     await self.cleanup_memory()
                 
                 # Wait before next iteration
@@ -604,18 +957,38 @@ class TelegramLogger:
     
     async def close(self) -> None:
         """Close the bot and cleanup resources."""
+        self._shutdown_event.set()
+        if self._closed:
+            return
+        self._closed = True
+        self._remove_signal_handlers()
+        
         logger.info("Shutting down Telegram Logger Bot...")
         
         try:
+            # Ask the message writer to stop and let any batch it is storing
+            # finish, then drain what is left
+            if self._writer_task and not self._writer_task.done():
+                self._writer_stopping = True
+                self._message_flush_event.set()
+                await self._writer_task
+            
             # Process remaining items in queues
             if self.message_queue:
                 logger.info(f"Processing {len(self.message_queue)} remaining messages...")
-                await self._process_message_queue()
+                await self._process_message_queue(drain_all=True)
             
             if self.action_queue:
                 logger.info(f"Processing {len(self.action_queue)} remaining actions...")
                 await self._process_action_queue()
             
+            # Ask the chat/user info flusher to stop and let any write it has in
+            # progress finish, then write what is still pending
+            if self._info_flush_task and not self._info_flush_task.done():
+                self._info_flush_stop.set()
+                await self._info_flush_task
+            await self._flush_chat_and_user_info()
+            
             # Cancel any running backfill tasks
             for task in self.backfill_tasks.values():
                 if not task.done():
@@ -625,10 +998,19 @@ class TelegramLogger:
                     except asyncio.CancelledError:
                         pass
             
+            # Stop the health check server
+            if self._health_runner:
+                await self._health_runner.cleanup()
+                self._health_runner = None
+            
             # Close database connection
             if self.db_manager:
                 await self.db_manager.close()
             
+            # Close the shared HTTP session
+            if self.http_session and not self.http_session.closed:
+                await self.http_session.close()
+            
             
             # Stop the bot
             if self.application.running:
@@ -658,4 +1040,6 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    # Share the entry point's event loop setup (uvloop when installed)
+    from .main import run
+    run(main) 
\ No newline at end of file
@@ -6,12 +6,15 @@ and provides validation for required settings.
 """
 
 import os
+import re
+from functools import cached_property
 from pathlib import Path
-from typing import Optional, List
+from types import MappingProxyType
+from typing import Annotated, Any, FrozenSet, Mapping, Optional
 from enum import Enum
 
 from pydantic import BaseModel, Field, field_validator, ConfigDict
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
 
 
 class LogLevel(str, Enum):
@@ -24,6 +27,32 @@ class LogLevel(str, Enum):
     DEBUG = "DEBUG"
 
 
+# Database table names for different data types
+_TABLE_NAMES: Mapping[str, str] = MappingProxyType({
+    "messages": "telegram_messages",
+    "actions": "telegram_actions",
+    "checkpoints": "telegram_checkpoints",
+    "chats": "telegram_chats",
+    "users": "telegram_users",
+})
+
+# Telegram bot permissions required for logging and backfill
+_REQUIRED_PERMISSIONS = frozenset({
+    "read_messages",
+    "read_message_history",
+    "view_channel",
+})
+
+# Scheme followed by a non-empty host
+_SUPABASE_URL_RE = re.compile(r"^https?://[^\s/]+")
+
+# Unprivileged TCP port, bounds enforced by pydantic-core
+Port = Annotated[int, Field(ge=1024, le=65535)]
+
+# Comma-separated values read from the environment as-is (not JSON-decoded)
+CsvSet = Annotated[FrozenSet[str], NoDecode]
+
+
 class Config(BaseSettings):
     """
     Configuration settings for the Telegram Logger Bot.
@@ -37,7 +66,7 @@ class Config(BaseSettings):
         env_file_encoding="utf-8",
         case_sensitive=False,
         extra="forbid",
-        validate_assignment=True
+        frozen=True
     )
     
     # Telegram Bot Configuration
@@ -47,6 +76,7 @@ class Config(BaseSettings):
     supabase_url: str = Field(..., description="Supabase project URL", alias="supabase_url")
     supabase_key: str = Field(..., description="Supabase anon key", alias="supabase_key")
     supabase_service_role_key: Optional[str] = Field(None, description="Supabase service role key (for admin operations)", alias="SUPABASE_SERVICE_ROLE_KEY")
+    supabase_db_url: Optional[str] = Field(None, description="Postgres connection string for direct bulk writes (requires asyncpg)", alias="SUPABASE_DB_URL")
     
     # Logging Configuration
     log_level: LogLevel = Field(LogLevel.INFO, description="Logging level", alias="LOG_LEVEL")
@@ -56,13 +86,16 @@ class Config(BaseSettings):
     log_backup_count: int = Field(5, description="Number of log backups to keep", alias="LOG_BACKUP_COUNT")
     
     # Database Configuration
-    max_retries: int = Field(3, description="Maximum number of database operation retries", alias="MAX_RETRIES")
-    retry_delay: float = Field(5.0, description="Delay between retries in seconds", alias="RETRY_DELAY")
+    max_retries: int = Field(3, ge=1, le=10, description="Maximum number of database operation retries", alias="MAX_RETRIES")
+    retry_delay: float = Field(5.0, ge=0.1, le=60.0, description="Delay between retries in seconds", alias="RETRY_DELAY")
     connection_timeout: int = Field(30, description="Database connection timeout in seconds", alias="CONNECTION_TIMEOUT")
+    supabase_pool_size: int = Field(5, ge=1, le=15, description="Database connections kept open", alias="SUPABASE_POOL_SIZE")
+    supabase_max_overflow: int = Field(3, ge=0, le=15, description="Extra database connections allowed under load", alias="SUPABASE_MAX_OVERFLOW")
+    supabase_pool_timeout: float = Field(30.0, ge=1.0, le=300.0, description="Seconds to wait for a free database connection", alias="SUPABASE_POOL_TIMEOUT")
     
     # Backfill Configuration
     backfill_enabled: bool = Field(True, description="Enable automatic backfilling", alias="BACKFILL_ENABLED")
-    backfill_chunk_size: int = Field(100, description="Number of messages to process per chunk during backfill", alias="BACKFILL_CHUNK_SIZE")
+    backfill_chunk_size: int = Field(100, ge=1, le=1000, description="Number of messages to process per chunk during backfill", alias="BACKFILL_CHUNK_SIZE")
     backfill_delay_seconds: float = Field(1.0, description="Delay between backfill chunks in seconds", alias="BACKFILL_DELAY_SECONDS")
     backfill_max_age_days: Optional[int] = Field(None, description="Maximum age of messages to backfill (None for all)", alias="BACKFILL_MAX_AGE_DAYS")
     backfill_on_startup: bool = Field(True, description="Run backfill on bot startup", alias="BACKFILL_ON_STARTUP")
@@ -78,20 +111,28 @@ class Config(BaseSettings):
     process_channel_messages: bool = Field(True, description="Process channel messages", alias="PROCESS_CHANNEL_MESSAGES")
     
     # Chat and Channel Filtering
-    allowed_chats: Optional[str] = Field(None, description="Comma-separated list of chat IDs to monitor", alias="ALLOWED_CHATS")
-    ignored_chats: str = Field("", description="Comma-separated list of chat IDs to ignore", alias="IGNORED_CHATS")
-    allowed_channels: Optional[str] = Field(None, description="Comma-separated list of channel usernames to monitor", alias="ALLOWED_CHANNELS")
-    ignored_channels: str = Field("", description="Comma-separated list of channel usernames to ignore", alias="IGNORED_CHANNELS")
+    allowed_chats: CsvSet = Field(frozenset(), description="Comma-separated list of chat IDs to monitor", alias="ALLOWED_CHATS")
+    ignored_chats: CsvSet = Field(frozenset(), description="Comma-separated list of chat IDs to ignore", alias="IGNORED_CHATS")
+    allowed_channels: CsvSet = Field(frozenset(), description="Comma-separated list of channel usernames to monitor", alias="ALLOWED_CHANNELS")
+    ignored_channels: CsvSet = Field(frozenset(), description="Comma-separated list of channel usernames to ignore", alias="IGNORED_CHANNELS")
     
     # Performance Configuration
-    batch_size: int = Field(5, description="Batch size for database operations", alias="BATCH_SIZE")
+    batch_size: int = Field(5, ge=1, le=500, description="Batch size for database operations", alias="BATCH_SIZE")
     flush_interval: int = Field(5, description="Interval to flush pending operations in seconds", alias="FLUSH_INTERVAL")
     max_queue_size: int = Field(10000, description="Maximum size of message queue", alias="MAX_QUEUE_SIZE")
+    stats_cache_seconds: float = Field(300.0, ge=0, description="How long exact database statistics are reused", alias="STATS_CACHE_SECONDS")
+    stats_estimate_cache_seconds: float = Field(3600.0, ge=0, description="How long estimated database statistics are reused", alias="STATS_ESTIMATE_CACHE_SECONDS")
+    
     
+    # Health Check Configuration
+    health_check_enabled: bool = Field(True, description="Enable the health check HTTP server", alias="HEALTH_CHECK_ENABLED")
+    health_check_port: Port = Field(8080, description="Port for the health check server", alias="HEALTH_CHECK_PORT")
+    health_cache_seconds: float = Field(5.0, ge=0, le=300, description="How long a /health result is reused before the database is checked again", alias="HEALTH_CACHE_SECONDS")
+    health_check_timeout: float = Field(5.0, gt=0, le=60, description="Seconds a /health database check may take before it is reported as failed", alias="HEALTH_CHECK_TIMEOUT")
     
     # Metrics Configuration
     metrics_enabled: bool = Field(False, description="Enable metrics collection", alias="METRICS_ENABLED")
-    metrics_port: int = Field(9090, description="Port for metrics server", alias="METRICS_PORT")
+    metrics_port: Port = Field(9090, description="Port for metrics server", alias="METRICS_PORT")
     
     @field_validator("telegram_token")
     @classmethod
@@ -105,13 +146,8 @@ class Config(BaseSettings):
     @classmethod
     def validate_supabase_url(cls, v: str) -> str:
         """Validate Supabase URL format."""
-        if not v.startswith(("https://", "http://")):
-            raise ValueError("Supabase URL must start with https:// or http://")
-        
-        # Basic URL format validation
-        if not v.replace("https://", "").replace("http://", "").strip():
-            raise ValueError("Supabase URL must contain a valid domain")
-            
+        if not _SUPABASE_URL_RE.match(v):
+            raise ValueError("Supabase URL must start with https:// or http:// followed by a valid domain")
         return v
     
     @field_validator("supabase_key")
@@ -122,119 +158,41 @@ class Config(BaseSettings):
             raise ValueError("Supabase key appears to be invalid (too short)")
         return v
     
-    @field_validator("backfill_chunk_size")
-    @classmethod
-    def validate_backfill_chunk_size(cls, v: int) -> int:
-        """Validate backfill chunk size."""
-        if v < 1 or v > 1000:
-            raise ValueError("Backfill chunk size must be between 1 and 1000")
-        return v
-    
-    @field_validator("batch_size")
+    @field_validator("allowed_chats", "ignored_chats", "allowed_channels", "ignored_channels", mode="before")
     @classmethod
-    def validate_batch_size(cls, v: int) -> int:
-        """Validate batch size."""
-        if v < 1 or v > 500:
-            raise ValueError("Batch size must be between 1 and 500")
+    def split_csv(cls, v: Any) -> Any:
+        """Split comma-separated filter values into a set of stripped items."""
+        if v is None:
+            return frozenset()
+        if isinstance(v, str):
+            return frozenset(item.strip() for item in v.split(",") if item.strip())
         return v
     
-    @field_validator("max_retries")
-    @classmethod
-    def validate_max_retries(cls, v: int) -> int:
-        """Validate max retries."""
-        if v < 1 or v > 10:
-            raise ValueError("Max retries must be between 1 and 10")
-        return v
-    
-    @field_validator("retry_delay")
-    @classmethod
-    def validate_retry_delay(cls, v: float) -> float:
-        """Validate retry delay."""
-        if v < 0.1 or v > 60.0:
-            raise ValueError("Retry delay must be between 0.1 and 60.0 seconds")
-        return v
-    
-    @field_validator("metrics_port")
-    @classmethod
-    def validate_port(cls, v: int) -> int:
-        """Validate port numbers."""
-        if v < 1024 or v > 65535:
-            raise ValueError("Port must be between 1024 and 65535")
-        return v
-    
-    @property
+    @cached_property
     def is_production(self) -> bool:
         """Check if running in production mode."""
         return not self.enable_debug and self.log_level in (LogLevel.INFO, LogLevel.WARNING, LogLevel.ERROR)
     
-    @property
-    def allowed_chats_list(self) -> List[str]:
-        """Get allowed chats as a list."""
-        if not self.allowed_chats:
-            return []
-        return [item.strip() for item in self.allowed_chats.split(",") if item.strip()]
-    
-    @property
-    def ignored_chats_list(self) -> List[str]:
-        """Get ignored chats as a list."""
-        if not self.ignored_chats:
-            return []
-        return [item.strip() for item in self.ignored_chats.split(",") if item.strip()]
-    
-    @property
-    def allowed_channels_list(self) -> List[str]:
-        """Get allowed channels as a list."""
-        if not self.allowed_channels:
-            return []
-        return [item.strip() for item in self.allowed_channels.split(",") if item.strip()]
-    
-    @property
-    def ignored_channels_list(self) -> List[str]:
-        """Get ignored channels as a list."""
-        if not self.ignored_channels:
-            return []
-        return [item.strip() for item in self.ignored_channels.split(",") if item.strip()]
-    
     def should_process_chat(self, chat_id: str) -> bool:
         """Check if a chat should be processed."""
-        if chat_id in self.ignored_chats_list:
+        if chat_id in self.ignored_chats:
             return False
-        if not self.allowed_chats_list:
-            return True
-        return chat_id in self.allowed_chats_list
+        return not self.allowed_chats or chat_id in self.allowed_chats
     
     def should_process_channel(self, channel_username: str) -> bool:
         """Check if a channel should be processed."""
-        if channel_username in self.ignored_channels_list:
+        if channel_username in self.ignored_channels:
             return False
-        if not self.allowed_channels_list:
-            return True
-        return channel_username in self.allowed_channels_list
+        return not self.allowed_channels or channel_username in self.allowed_channels
     
-    def get_database_table_names(self) -> dict[str, str]:
+    def get_database_table_names(self) -> Mapping[str, str]:
         """Get database table names for different data types."""
-        return {
-            "messages": "telegram_messages",
-            "actions": "telegram_actions", 
-            "checkpoints": "telegram_checkpoints",
-            "chats": "telegram_chats",
-            "users": "telegram_users",
-        }
-    
-    def validate_required_permissions(self) -> List[str]:
-        """Return list of required Telegram bot permissions."""
-        permissions = [
-            "read_messages",
-            "read_message_history",
-            "view_channel",
-        ]
-        
-        if self.backfill_enabled:
-            permissions.extend([
-                "read_message_history",
-            ])
-        
-        return permissions
+        return _TABLE_NAMES
+    
+    def validate_required_permissions(self) -> FrozenSet[str]:
+        """Return the set of required Telegram bot permissions."""
+        # Backfill needs read_message_history, which is already always required
+        return _REQUIRED_PERMISSIONS
     
     def create_directories(self) -> None:
         """Create necessary directories for logs and data."""
@@ -260,8 +218,13 @@ def load_config() -> Config:
         ValidationError: If configuration validation fails
     """
     try:
-        # Try to load configuration - BaseSettings automatically loads from env vars
-        config = Config()  # type: ignore[call-arg]
+        # Prefer a mounted JSON config file when one is provided
+        json_path = os.environ.get("CONFIG_JSON_PATH")
+        if json_path:
+            config = load_config_from_json(json_path)
+        else:
+            # Try to load configuration - BaseSettings automatically loads from env vars
+            config = Config()  # type: ignore[call-arg]
         
         # Create necessary directories
         config.create_directories()
@@ -272,6 +235,24 @@ def load_config() -> Config:
         raise ValueError(f"Failed to load configuration: {e}") from e
 
 
+def load_config_from_json(path: str) -> Config:
+    """
+    Load and validate configuration from a JSON file.
+    
+    The file is parsed and validated in a single pass; keys use the same
+    names as the environment variables. Environment variables and .env
+    files are not consulted.
+    
+    Args:
+        path: Path to the JSON configuration file
+        
+    Returns:
+        Config: Validated configuration object
+    """
+    with open(path, "rb") as f:
+        return Config.model_validate_json(f.read())
+
+
 def load_config_with_overrides(**overrides) -> Config:
     """
     Load configuration with specific overrides for testing.
@@ -283,17 +264,59 @@ def load_config_with_overrides(**overrides) -> Config:
         Config: Configuration object with overrides
     """
     try:
-        # Create config with overrides
-        config = Config(**overrides)
+        # Reuse the validated base config where possible, otherwise build from scratch
+        config = _copy_base_config(overrides) or Config(**overrides)
         config.create_directories()
         return config
     except Exception as e:
         raise ValueError(f"Failed to load configuration with overrides: {e}") from e
 
 
+def _copy_base_config(overrides: dict[str, Any]) -> Optional[Config]:
+    """
+    Apply overrides on top of the cached base configuration.
+    
+    The merged values are validated directly, so the environment and
+    .env file are not read again.
+    
+    Args:
+        overrides: Configuration values to override, keyed by alias or field name
+        
+    Returns:
+        Config with overrides applied, or None if a full Config build is required
+    """
+    global _base_config
+    aliases = {(field.alias or name).lower(): name for name, field in Config.model_fields.items()}
+    names = [aliases.get(key.lower()) for key in overrides]
+    if None in names or _FULL_VALIDATION_FIELDS.intersection(names):
+        return None
+    
+    if _base_config is None:
+        try:
+            _base_config = Config()  # type: ignore[call-arg]
+        except Exception:
+            return None
+    
+    values = _base_config.model_dump(by_alias=True)
+    for name, value in zip(names, overrides.values()):
+        values[Config.model_fields[name].alias or name] = value
+    return Config.model_validate(values)
+
+
 # Global configuration instance
 _config: Optional[Config] = None
 
+# Validated base configuration reused by load_config_with_overrides
+_base_config: Optional[Config] = None
+
+# Credentials are always validated with a full Config build when overridden
+_FULL_VALIDATION_FIELDS = frozenset({
+    "telegram_token",
+    "supabase_url",
+    "supabase_key",
+    "supabase_service_role_key",
+})
+
 
 def get_config() -> Config:
     """
@@ -318,12 +341,14 @@ def reload_config() -> Config:
     Returns:
         Config: The new configuration object
     """
-    global _config
+    global _config, _base_config
     _config = load_config()
+    _base_config = None
     return _config
 
 
 def reset_config() -> None:
     """Reset the global configuration instance (useful for testing)."""
-    global _config
-    _config = None 
\ No newline at end of file
+    global _config, _base_config
+    _config = None
+    _base_config = None 
\ No newline at end of file
@@ -7,16 +7,22 @@ and retry logic.
 """
 
 import asyncio
+import time
 import uuid
 from datetime import datetime, timezone, timedelta
-from typing import Any, Dict, List, Optional, Union, Tuple, Callable
+from typing import Any, Dict, FrozenSet, List, Optional, Union, Tuple, Callable
+from collections import OrderedDict
 from contextlib import asynccontextmanager
-from functools import lru_cache
 import json
 
+import aiohttp
+import httpx
+from postgrest.exceptions import APIError
+from postgrest.types import ReturnMethod
 from telegram import Message, Chat, User, Update
-from supabase import create_client, Client
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from supabase import acreate_client, AsyncClient, AsyncClientOptions
+from pydantic import BaseModel
+from tenacity import retry, stop_after_attempt, wait_random_exponential, retry_if_exception_type
 
 try:
     from loguru import logger
@@ -26,11 +32,161 @@ except ImportError:
     logger = logging.getLogger(__name__)
     logging.basicConfig(level=logging.INFO)
 
+try:
+    import asyncpg
+except ImportError:
+    # Bulk COPY writes are disabled without asyncpg
+    asyncpg = None
+
+try:
+    import h2  # noqa: F401
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    # Fall back to HTTP/1.1 keep-alive connections if h2 not available
+    _HTTP2_AVAILABLE = False
+
+try:
+    import orjson
+except ImportError:
+    # Fall back to the supabase-py client for inserts if orjson not available
+    orjson = None
+
 from .config import Config
 from .models import (
-    MessageModel, ActionModel, CheckpointModel, 
-    ChatInfoModel, UserInfoModel, ActionType, MessageType, ChatType
+    MessageModel, ActionModel, CheckpointModel, AttachmentModel,
+    ChatInfoModel, UserInfoModel, ActionType, MessageType, ChatType, QueuedAction
+)
+
+
+# Single-message upserts are coalesced into batches of at most this many rows,
+# waiting at most this many seconds for a batch to fill
+_MESSAGE_BATCH_MAX = 200
+_MESSAGE_BATCH_WAIT = 0.25
+
+# Message batches larger than this are COPYed straight into Postgres when a
+# database URL is configured, bypassing PostgREST's JSON request overhead
+_COPY_BATCH_MIN = 500
+_PG_POOL_RECYCLE = 1800  # Seconds an idle pooled connection is kept before being closed
+
+# Tables with fewer estimated rows than this are counted exactly
+_EXACT_COUNT_THRESHOLD = 100_000
+
+# PostgREST error code for a function missing from the schema cache
+_FUNCTION_NOT_FOUND = "PGRST202"
+
+# PostgreSQL error code for a function the API role may not execute
+_FUNCTION_NOT_PERMITTED = "42501"
+
+# Old rows are deleted in batches of at most this many per request
+_CLEANUP_BATCH_SIZE = 10_000
+
+# Statistics keys and the tables whose rows they count
+_STATS_TABLES = (
+    ("total_messages", "messages"),
+    ("total_actions", "actions"),
+    ("total_chats", "chats"),
+)
+
+# Checkpoint updates are kept in memory and written at most this often (seconds)
+_CHECKPOINT_FLUSH_INTERVAL = 2.0
+
+# MessageModel fields with no column in the messages table
+_MESSAGE_FIELDS_NOT_STORED = frozenset({
+    "connected_website",
+    "passport_data",
+    "proximity_alert_triggered",
+    "video_chat_scheduled",
+    "video_chat_started",
+    "video_chat_ended",
+    "video_chat_participants_invited",
+})
+
+# Chat and user attributes that make up the stored info; an unchanged
+# signature over these means the upsert can be skipped
+_CHAT_SIGNATURE_ATTRS = (
+    "type", "title", "username", "first_name", "last_name", "bio", "description",
+    "invite_link", "slow_mode_delay", "message_auto_delete_time", "has_protected_content",
+    "has_private_forwards", "has_restricted_voice_and_video_messages",
+    "join_to_send_messages", "join_by_request", "is_forum", "active_usernames",
+    "emoji_status_custom_emoji_id", "has_hidden_members", "has_aggressive_anti_spam_enabled",
+)
+_USER_SIGNATURE_ATTRS = (
+    "is_bot", "first_name", "last_name", "username", "language_code", "is_premium",
+    "added_to_attachment_menu", "can_join_groups", "can_read_all_group_messages",
+    "supports_inline_queries",
 )
+_MAX_INFO_SIGNATURES = 4096  # Chats/users whose last stored signature is remembered
+
+# Seconds an idle keep-alive connection to Supabase is kept open
+_HTTP_KEEPALIVE_EXPIRY = 30
+
+
+# Message attributes checked in order to determine the message type; text is
+# by far the most common, and the media order matches Telegram's precedence
+_MESSAGE_TYPE_ATTRS: Tuple[Tuple[str, MessageType], ...] = (
+    ("text", MessageType.TEXT),
+    ("photo", MessageType.PHOTO),
+    ("video", MessageType.VIDEO),
+    ("audio", MessageType.AUDIO),
+    ("document", MessageType.DOCUMENT),
+    ("voice", MessageType.VOICE),
+    ("video_note", MessageType.VIDEO_NOTE),
+    ("sticker", MessageType.STICKER),
+    ("animation", MessageType.ANIMATION),
+    ("contact", MessageType.CONTACT),
+    ("dice", MessageType.DICE),
+    ("game", MessageType.GAME),
+    ("poll", MessageType.POLL),
+    ("venue", MessageType.VENUE),
+    ("location", MessageType.LOCATION),
+    ("invoice", MessageType.INVOICE),
+    ("successful_payment", MessageType.SUCCESSFUL_PAYMENT),
+    ("web_app_data", MessageType.WEB_APP_DATA),
+)
+
+# Message types whose text content comes from the caption
+_CAPTIONED_MESSAGE_TYPES = frozenset({
+    MessageType.PHOTO,
+    MessageType.VIDEO,
+    MessageType.AUDIO,
+    MessageType.DOCUMENT,
+    MessageType.VOICE,
+    MessageType.VIDEO_NOTE,
+    MessageType.ANIMATION,
+})
+
+
+def _unique_columns(rows: List[Dict[str, Any]]) -> List[str]:
+    """Return every key used across the rows, in first-seen order."""
+    return list(dict.fromkeys(key for row in rows for key in row))
+
+
+def _opt_dict(value: Any) -> Optional[Dict[str, Any]]:
+    """Return the Telegram object as a dict, or None if it is absent."""
+    return value.to_dict() if value else None
+
+
+def _opt_dict_list(values: Any) -> Optional[List[Dict[str, Any]]]:
+    """Return a sequence of Telegram objects as dicts, or None if it is empty."""
+    return [value.to_dict() for value in values] if values else None
+
+
+# Query builders passed to _execute_with_retry with their arguments, instead of
+# closures allocated on every call
+
+def _call_function(client: AsyncClient, function: str, params: Dict[str, Any]) -> Any:
+    """Build a call to a database function."""
+    return client.rpc(function, params)
+
+
+def _count_query(client: AsyncClient, table: Any, method: str) -> Any:
+    """Build a row count of a table that returns no rows."""
+    return table.select("id", count=method, head=True)
+
+
+def _delete_older_query(client: AsyncClient, table: Any, time_column: str, cutoff: str) -> Any:
+    """Build a delete of rows older than a cutoff that returns only the count."""
+    return table.delete(count="exact", returning=ReturnMethod.minimal).lt(time_column, cutoff)
 
 
 class DatabaseError(Exception):
@@ -53,6 +209,41 @@ class ConnectionError(DatabaseError):
     pass
 
 
+# Retry transient failures with jittered exponential backoff so concurrent
+# callers hitting the same outage do not retry in lockstep
+_retry_database = retry(
+    stop=stop_after_attempt(5),
+    wait=wait_random_exponential(multiplier=0.5, max=30),
+    retry=retry_if_exception_type(RetryableError)
+)
+
+# PostgREST error codes worth retrying: HTTP statuses reported for non-JSON
+# error bodies, PostgREST's own database connection/pool errors, and
+# PostgreSQL connection, resource and serialization failures
+_RETRYABLE_API_ERROR_CODES = frozenset({
+    "500", "502", "503", "504",
+    "PGRST000", "PGRST001", "PGRST002", "PGRST003",
+    "08000", "08001", "08003", "08004", "08006",
+    "40001", "40P01", "53300", "57014", "57P01",
+})
+
+
+def _is_retryable(error: Exception) -> bool:
+    """
+    Check whether a failed database request is worth retrying.
+    
+    Args:
+        error: Exception raised by the request
+        
+    Returns:
+        True for transport failures and transient API errors
+    """
+    if isinstance(error, APIError):
+        # Non-JSON error bodies carry the HTTP status as an int code
+        return str(error.code) in _RETRYABLE_API_ERROR_CODES
+    return isinstance(error, (httpx.TransportError, asyncio.TimeoutError))
+
+
 class SupabaseManager:
     """
     Manages all interactions with the Supabase database.
@@ -69,28 +260,114 @@ class SupabaseManager:
             config: Configuration object containing Supabase credentials
         """
         self.config = config
-        self.client: Optional[Client] = None
+        self.client: Optional[AsyncClient] = None
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._pg_pool: Optional["asyncpg.Pool"] = None
+        self.http_session: Optional[aiohttp.ClientSession] = None
+        self._rest_url = f"{config.supabase_url.rstrip('/')}/rest/v1"
+        self._rest_headers = {
+            "apikey": config.supabase_key,
+            "Authorization": f"Bearer {config.supabase_key}",
+            "Content-Type": "application/json",
+            "Prefer": "return=minimal",
+        }
+        # Direct requests get the same limits as the httpx pool: connection_timeout
+        # to connect and between reads, supabase_pool_timeout to get a connection,
+        # instead of aiohttp's 300s total default
+        self._rest_timeout = aiohttp.ClientTimeout(
+            connect=config.supabase_pool_timeout,
+            sock_connect=config.connection_timeout,
+            sock_read=config.connection_timeout
+        )
+        # Upsert headers keyed by whether duplicates are ignored rather than merged
+        self._upsert_headers = {
+            ignore_duplicates: {
+                **self._rest_headers,
+                "Prefer": f"return=minimal,resolution={'ignore' if ignore_duplicates else 'merge'}-duplicates",
+            }
+            for ignore_duplicates in (False, True)
+        }
         self.table_names = config.get_database_table_names()
+        self._tables: Dict[str, Any] = {}
         self._connection_lock = asyncio.Lock()
+        # Requests in flight are capped at the pool size plus overflow; the rest
+        # wait for a slot, up to the pool timeout
+        self._max_connections = config.supabase_pool_size + config.supabase_max_overflow
+        self._connection_slots = asyncio.Semaphore(self._max_connections)
         self._initialized = False
-        self._stats_cache: Dict[str, Any] = {}
-        self._cache_ttl = 300  # 5 minutes cache TTL
-        self._last_cache_update = datetime.now(timezone.utc)
+        self._pending_messages: "asyncio.Queue[Tuple[Dict[str, Any], asyncio.Future]]" = asyncio.Queue()
+        self._message_flush_task: Optional[asyncio.Task] = None
+        # Latest unwritten checkpoint fields keyed by checkpoint_id
+        self._pending_checkpoints: Dict[str, Dict[str, Any]] = {}
+        self._checkpoint_flush_task: Optional[asyncio.Task] = None
+        # Set by close() so the flusher finishes its current write and flushes once more
+        self._checkpoint_flush_stop = asyncio.Event()
+        self._chat_signatures: OrderedDict[int, int] = OrderedDict()
+        self._user_signatures: OrderedDict[int, int] = OrderedDict()
+        # Cached statistics keyed by whether they are exact, with the monotonic
+        # time they go stale; estimates drift slowly and are kept much longer
+        self._stats_caches: Dict[bool, Tuple[float, Dict[str, Any]]] = {}
+        self._stats_cache_ttls = {
+            True: config.stats_cache_seconds,
+            False: config.stats_estimate_cache_seconds,
+        }
+        self._stats_rpc_available = True
+        self._cleanup_rpc_available = True
+        self._health_rpc_available = True
+        
+    async def initialize(self, http_session: Optional[aiohttp.ClientSession] = None) -> None:
+        """
+        Initialize the Supabase client and verify connection.
+        
+        Args:
+            http_session: Shared HTTP session for direct outbound requests
+        """
+        if http_session is not None:
+            self.http_session = http_session
         
-    async def initialize(self) -> None:
-        """Initialize the Supabase client and verify connection."""
         async with self._connection_lock:
             if self._initialized and self.client is not None:
                 return
                 
             try:
-                self.client = create_client(
+                # Reuse TCP/TLS connections across requests instead of the client defaults
+                if self._http_client is None:
+                    self._http_client = httpx.AsyncClient(
+                        limits=httpx.Limits(
+                            max_connections=self._max_connections,
+                            max_keepalive_connections=self.config.supabase_pool_size,
+                            keepalive_expiry=_HTTP_KEEPALIVE_EXPIRY
+                        ),
+                        timeout=httpx.Timeout(
+                            self.config.connection_timeout,
+                            pool=self.config.supabase_pool_timeout
+                        ),
+                        http2=_HTTP2_AVAILABLE,
+                        follow_redirects=True
+                    )
+                    logger.info(
+                        f"Supabase HTTP pool: max_connections={self._max_connections}, "
+                        f"max_keepalive={self.config.supabase_pool_size}, http2={_HTTP2_AVAILABLE}"
+                    )
+                
+                # The async client awaits requests on the event loop, with no worker threads
+                self.client = await acreate_client(
                     self.config.supabase_url,
-                    self.config.supabase_key
+                    self.config.supabase_key,
+                    options=AsyncClientOptions(httpx_client=self._http_client)
                 )
                 
+                # Request builders are stateless, so bind each table once and reuse it
+                self._tables = {
+                    key: self.client.table(table_name)
+                    for key, table_name in self.table_names.items()
+                }
+                
                 # Test connection by attempting to read from a table
                 await self._test_connection()
+                
+                if self._pg_pool is None and self.config.supabase_db_url:
+                    await self._create_pg_pool()
                 self._initialized = True
                 logger.info("Successfully connected to Supabase database")
                 
@@ -98,38 +375,83 @@ class SupabaseManager:
                 logger.error(f"Failed to initialize Supabase client: {e}")
                 raise ConnectionError(f"Database initialization failed: {e}") from e
     
-    def _ensure_client(self) -> Client:
+    async def _create_pg_pool(self) -> None:
+        """Create the Postgres pool used for bulk COPY writes, if asyncpg is installed."""
+        if asyncpg is None:
+            logger.warning("SUPABASE_DB_URL is set but asyncpg is not installed; bulk COPY is disabled")
+            return
+        
+        try:
+            # Supabase's pooler (Supavisor) in transaction mode does not keep
+            # named prepared statements across transactions, so never cache them
+            self._pg_pool = await asyncpg.create_pool(
+                self.config.supabase_db_url,
+                min_size=self.config.supabase_pool_size,
+                max_size=self._max_connections,
+                statement_cache_size=0,
+                max_cached_statement_lifetime=0,
+                max_inactive_connection_lifetime=_PG_POOL_RECYCLE,
+                server_settings={"jit": "off"},
+                setup=self._ping_pg_connection
+            )
+            logger.info(f"Postgres pool for bulk writes: size={self.config.supabase_pool_size}-{self._max_connections}")
+        except Exception as e:
+            # PostgREST still handles every write, just without the COPY fast path
+            logger.warning(f"Could not connect to SUPABASE_DB_URL, bulk COPY is disabled: {e}")
+    
+    @asynccontextmanager
+    async def _connection_slot(self):
+        """
+        Hold one of the bounded database connection slots.
+        
+        Raises:
+            asyncio.TimeoutError: If no slot frees up within the pool timeout
+        """
+        try:
+            await asyncio.wait_for(
+                self._connection_slots.acquire(),
+                timeout=self.config.supabase_pool_timeout
+            )
+        except asyncio.TimeoutError:
+            raise asyncio.TimeoutError(
+                f"No free database connection within {self.config.supabase_pool_timeout}s "
+                f"({self._max_connections} in use)"
+            ) from None
+        
+        try:
+            yield
+        finally:
+            self._connection_slots.release()
+    
+    @staticmethod
+    async def _ping_pg_connection(connection: "asyncpg.Connection") -> None:
+        """Check a pooled connection on checkout so a dropped one fails fast."""
+        await connection.execute("SELECT 1")
+    
+    def _ensure_client(self) -> AsyncClient:
         """Ensure client is initialized and return it."""
         if not self.client:
             raise ConnectionError("Database client not initialized. Call initialize() first.")
         return self.client
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type(RetryableError)
-    )
+    @_retry_database
     async def _test_connection(self) -> None:
         """Test the database connection."""
         try:
-            client = self._ensure_client()
+            self._ensure_client()
             
             # Try to query the checkpoints table (should exist)
-            result = client.table(self.table_names["checkpoints"]).select("*").limit(1).execute()
+            query = self._tables["checkpoints"].select("*").limit(1)
+            await query.execute()
             logger.debug("Database connection test successful")
         except Exception as e:
             logger.error(f"Database connection test failed: {e}")
-            # Determine if error is retryable
-            if "connection" in str(e).lower() or "timeout" in str(e).lower():
+            if _is_retryable(e):
                 raise RetryableError(f"Connection test failed: {e}") from e
             else:
                 raise NonRetryableError(f"Connection test failed: {e}") from e
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type(RetryableError)
-    )
+    @_retry_database
     async def _execute_with_retry(
         self, 
         operation: Callable[..., Any], 
@@ -152,26 +474,51 @@ class SupabaseManager:
         Raises:
             DatabaseError: If the operation fails after all retries
         """
+        return await self._execute(operation, operation_name, *args, **kwargs)
+    
+    async def _execute(
+        self, 
+        operation: Callable[..., Any], 
+        operation_name: str,
+        *args,
+        **kwargs
+    ) -> Any:
+        """
+        Execute a database operation once.
+        
+        Args:
+            operation: The database operation to execute
+            operation_name: Name of the operation for logging
+            *args: Arguments to pass to the operation
+            **kwargs: Keyword arguments to pass to the operation
+            
+        Returns:
+            The result of the operation
+            
+        Raises:
+            RetryableError: If the operation failed with a transient error
+            NonRetryableError: If the operation failed otherwise
+        """
         try:
-            if not self.client:
+            client = self.client if self._initialized else None
+            if client is None:
                 await self.initialize()
-                
-            client = self._ensure_client()
+                client = self._ensure_client()
+            
             logger.debug(f"Executing {operation_name}")
-            result = operation(client, *args, **kwargs)
             
-            if hasattr(result, 'execute'):
-                result = result.execute()
-                
+            async with self._connection_slot():
+                result = operation(client, *args, **kwargs)
+                if hasattr(result, 'execute'):
+                    result = await result.execute()
+            
             logger.debug(f"Successfully executed {operation_name}. Result: {result.data}")
             return result
             
         except Exception as e:
             logger.warning(f"{operation_name} failed: {e}")
             
-            # Determine if this is a retryable error
-            error_str = str(e).lower()
-            if any(keyword in error_str for keyword in ["connection", "timeout", "network", "503", "502", "500"]):
+            if _is_retryable(e):
                 raise RetryableError(f"Retryable error in {operation_name}: {e}") from e
             else:
                 raise NonRetryableError(f"Non-retryable error in {operation_name}: {e}") from e
@@ -180,6 +527,9 @@ class SupabaseManager:
         """
         Store a Telegram message in the database.
         
+        The message is queued and written together with other messages stored
+        around the same time, in a single batched upsert.
+        
         Args:
             message: The Telegram message to store
             is_backfilled: Whether this message is from backfill operation
@@ -190,27 +540,102 @@ class SupabaseManager:
         try:
             message_model = self._convert_telegram_message(message, is_backfilled)
             message_dict = self._message_model_to_dict(message_model)
-            
-            def operation(client: Client) -> Any:
-                return client.table(self.table_names["messages"]).upsert(
-                    message_dict,
-                    on_conflict="message_id,chat_id"
-                )
-            
-            await self._execute_with_retry(
-                operation, 
-                f"store_message_{message.message_id}"
-            )
-            
-            logger.debug(f"Stored message {message.message_id} from {message.from_user}")
-            return True
-            
-        except NonRetryableError as e:
-            logger.error(f"Non-retryable error storing message {message.message_id}: {e}")
-            return False
         except Exception as e:
             logger.error(f"Failed to store message {message.message_id}: {e}")
             return False
+        
+        if self._message_flush_task is None:
+            self._message_flush_task = asyncio.create_task(self._message_flush_loop())
+        
+        future = asyncio.get_running_loop().create_future()
+        await self._pending_messages.put((message_dict, future))
+        stored = await future
+        
+        if stored:
+            logger.debug(f"Stored message {message.message_id} from {message.from_user}")
+        return stored
+    
+    async def store_message_bundle(self, message: Message, is_backfilled: bool = False) -> Tuple[bool, bool, bool]:
+        """
+        Store a message together with its chat and sender, concurrently.
+        
+        The three writes are independent, so they overlap instead of running
+        back to back. Unchanged chats and senders are skipped as usual.
+        
+        Args:
+            message: The Telegram message to store
+            is_backfilled: Whether this message is from backfill operation
+            
+        Returns:
+            Whether the message, chat and sender were stored (True when there is no sender)
+        """
+        async def store_sender() -> bool:
+            if message.from_user is None:
+                return True
+            return await self.store_user_info(message.from_user)
+        
+        message_stored, chat_stored, sender_stored = await asyncio.gather(
+            self.store_message(message, is_backfilled),
+            self.store_chat_info(message.chat),
+            store_sender()
+        )
+        return message_stored, chat_stored, sender_stored
+    
+    async def _message_flush_loop(self) -> None:
+        """Drain queued single-message upserts into batched upserts."""
+        loop = asyncio.get_running_loop()
+        batch: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        
+        try:
+            while True:
+                batch = [await self._pending_messages.get()]
+                deadline = loop.time() + _MESSAGE_BATCH_WAIT
+                
+                while len(batch) < _MESSAGE_BATCH_MAX:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._pending_messages.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                
+                await self._flush_message_batch(batch)
+                batch = []
+                
+        except asyncio.CancelledError:
+            # Flush everything still queued so awaiting callers are not left hanging
+            while not self._pending_messages.empty():
+                batch.append(self._pending_messages.get_nowait())
+            if batch:
+                await self._flush_message_batch(batch)
+            raise
+    
+    async def _flush_message_batch(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        """
+        Upsert a batch of queued messages and resolve their futures.
+        
+        Args:
+            batch: Pairs of message rows and the futures awaiting them
+        """
+        message_dicts = [message_dict for message_dict, _ in batch]
+        
+        try:
+            await self._upsert_rows(
+                "messages",
+                message_dicts,
+                "message_id,chat_id",
+                f"store_message_batch_{len(message_dicts)}",
+                ignore_duplicates=True
+            )
+            stored = True
+        except Exception as e:
+            logger.error(f"Failed to store {len(message_dicts)} queued messages: {e}")
+            stored = False
+        
+        for _, future in batch:
+            if not future.done():
+                future.set_result(stored)
     
     async def store_messages_batch(
         self, 
@@ -230,29 +655,51 @@ class SupabaseManager:
         if not messages:
             return 0
         
+        message_models = []
+        logged_at = datetime.now(timezone.utc)
+        for msg in messages:
+            try:
+                message_models.append(self._convert_telegram_message(msg, is_backfilled, logged_at))
+            except Exception as e:
+                logger.warning(f"Failed to convert message {msg.message_id}: {e}")
+        
+        return await self.bulk_insert_messages(message_models)
+    
+    async def bulk_insert_messages(self, message_models: List[MessageModel]) -> int:
+        """
+        Write already-converted messages in one round-trip.
+        
+        Large batches are COPYed straight into Postgres when a database URL is
+        configured; otherwise, or if the COPY fails, they are upserted through
+        PostgREST. Messages that are already stored are left unchanged.
+        
+        Args:
+            message_models: Messages to store
+            
+        Returns:
+            Number of successfully stored messages
+        """
+        if not message_models:
+            return 0
+        
+        message_dicts = []
         try:
-            message_dicts = []
-            for msg in messages:
+            message_dicts = [self._message_model_to_dict(model) for model in message_models]
+            
+            if self._pg_pool is not None and len(message_dicts) > _COPY_BATCH_MIN:
                 try:
-                    model = self._convert_telegram_message(msg, is_backfilled)
-                    message_dict = self._message_model_to_dict(model)
-                    message_dicts.append(message_dict)
+                    await self._copy_messages(message_dicts)
+                    logger.info(f"Copied batch of {len(message_dicts)} messages")
+                    return len(message_dicts)
                 except Exception as e:
-                    logger.warning(f"Failed to convert message {msg.message_id}: {e}")
-                    continue
-            
-            if not message_dicts:
-                return 0
-            
-            def operation(client: Client) -> Any:
-                return client.table(self.table_names["messages"]).upsert(
-                    message_dicts,
-                    on_conflict="message_id,chat_id"
-                )
-            
-            await self._execute_with_retry(
-                operation,
-                f"store_messages_batch_{len(message_dicts)}"
+                    logger.warning(f"Bulk COPY of {len(message_dicts)} messages failed, falling back to upsert: {e}")
+            
+            await self._upsert_rows(
+                "messages",
+                message_dicts,
+                "message_id,chat_id",
+                f"store_messages_batch_{len(message_dicts)}",
+                ignore_duplicates=True
             )
             
             logger.info(f"Stored batch of {len(message_dicts)} messages")
@@ -262,6 +709,38 @@ class SupabaseManager:
             logger.error(f"Failed to store message batch. Messages: {message_dicts}. Error: {e}")
             return 0
     
+    async def _copy_messages(self, message_dicts: List[Dict[str, Any]]) -> None:
+        """
+        Insert messages with a binary COPY into a staging table.
+        
+        Each row is staged as a single jsonb value and expanded with
+        jsonb_populate_record, so column types need no client-side mapping.
+        Existing messages are skipped, matching the PostgREST upsert.
+        
+        Args:
+            message_dicts: JSON-serializable message rows
+        """
+        table = self.table_names["messages"]
+        columns = ", ".join(f'"{column}"' for column in _unique_columns(message_dicts))
+        encode = (lambda row: orjson.dumps(row).decode()) if orjson is not None else json.dumps
+        
+        async with self._pg_pool.acquire(timeout=self.config.supabase_pool_timeout) as connection:
+            async with connection.transaction():
+                await connection.execute(
+                    "CREATE TEMP TABLE _message_stage (data jsonb) ON COMMIT DROP"
+                )
+                await connection.copy_records_to_table(
+                    "_message_stage",
+                    records=[(encode(row),) for row in message_dicts],
+                    columns=["data"]
+                )
+                await connection.execute(
+                    f'INSERT INTO "{table}" ({columns}) '
+                    f'SELECT {columns} FROM _message_stage, '
+                    f'jsonb_populate_record(NULL::"{table}", _message_stage.data) '
+                    f'ON CONFLICT (message_id, chat_id) DO NOTHING'
+                )
+    
     async def store_action(
         self, 
         action_type: ActionType, 
@@ -300,6 +779,7 @@ class SupabaseManager:
             True if successful, False otherwise
         """
         try:
+            occurred_at = datetime.now(timezone.utc)
             action_model = ActionModel(
                 action_id=str(uuid.uuid4()),
                 action_type=action_type,
@@ -314,14 +794,15 @@ class SupabaseManager:
                 action_data=action_data or {},
                 before_data=before_data,
                 after_data=after_data,
-                occurred_at=datetime.now(timezone.utc),
+                occurred_at=occurred_at,
+                logged_at=occurred_at,
                 is_backfilled=is_backfilled
             )
             
-            action_dict = self._action_model_to_dict(action_model)
+            action_dict = self._model_to_dict(action_model)
             
-            def operation(client: Client) -> Any:
-                return client.table(self.table_names["actions"]).insert(
+            def operation(client: AsyncClient) -> Any:
+                return self._tables["actions"].insert(
                     action_dict
                 )
             
@@ -336,6 +817,170 @@ class SupabaseManager:
         except Exception as e:
             logger.error(f"Failed to store action {action_type.value}: {e}")
             return False
+
+    async def store_actions_batch(
+        self,
+        actions: List[QueuedAction],
+        is_backfilled: bool = False
+    ) -> int:
+        """
+        Store multiple actions in a single batch operation.
+        
+        When a shared HTTP session and orjson are available the rows are encoded
+        with orjson and POSTed straight to PostgREST; otherwise the supabase-py
+        client is used.
+        
+        Args:
+            actions: List of queued actions to store
+            is_backfilled: Whether these actions are from backfill operation
+            
+        Returns:
+            Number of successfully stored actions
+        """
+        if not actions:
+            return 0
+        
+        action_models: List[ActionModel] = []
+        try:
+            occurred_at = datetime.now(timezone.utc)
+            for action in actions:
+                try:
+                    action_models.append(ActionModel(
+                        action_id=str(uuid.uuid4()),
+                        action_type=action.action_type,
+                        chat_id=action.chat_id,
+                        user_id=action.user_id,
+                        username=action.username,
+                        first_name=action.first_name,
+                        last_name=action.last_name,
+                        target_id=action.target_id,
+                        target_type=action.target_type,
+                        target_name=action.target_name,
+                        action_data=action.action_data or {},
+                        before_data=action.before_data,
+                        after_data=action.after_data,
+                        occurred_at=occurred_at,
+                        logged_at=occurred_at,
+                        is_backfilled=is_backfilled
+                    ))
+                except Exception as e:
+                    logger.warning(f"Failed to convert action {action.action_type}: {e}")
+                    continue
+            
+            if not action_models:
+                return 0
+            
+            if self.http_session is not None and orjson is not None:
+                # orjson encodes datetimes and enums natively, so no per-field conversion
+                await self._post_rows(
+                    self.table_names["actions"],
+                    [action_model.model_dump() for action_model in action_models]
+                )
+            else:
+                action_dicts = [self._model_to_dict(action_model) for action_model in action_models]
+                
+                def operation(client: AsyncClient) -> Any:
+                    return self._tables["actions"].insert(
+                        action_dicts
+                    )
+                
+                await self._execute_with_retry(
+                    operation,
+                    f"store_actions_batch_{len(action_dicts)}"
+                )
+            
+            logger.debug(f"Stored batch of {len(action_models)} actions")
+            return len(action_models)
+            
+        except Exception as e:
+            logger.error(f"Failed to store action batch of {len(action_models)}: {e}")
+            return 0
+    
+    @_retry_database
+    async def _post_rows(
+        self,
+        table_name: str,
+        rows: Union[Dict[str, Any], List[Dict[str, Any]]],
+        on_conflict: Optional[str] = None,
+        ignore_duplicates: bool = False
+    ) -> None:
+        """
+        Insert rows by POSTing an orjson-encoded body directly to PostgREST.
+        
+        Args:
+            table_name: Name of the table to insert into
+            rows: Row or rows to insert; datetimes and enums are encoded by orjson
+            on_conflict: Comma-separated conflict columns to upsert on
+            ignore_duplicates: Skip conflicting rows instead of merging them
+            
+        Raises:
+            RetryableError: On network errors and 5xx responses
+            NonRetryableError: On other error responses
+        """
+        if self.http_session is None or orjson is None:
+            raise NonRetryableError("Direct PostgREST inserts require an HTTP session and orjson")
+        
+        url = f"{self._rest_url}/{table_name}"
+        body = orjson.dumps(rows, option=orjson.OPT_UTC_Z | orjson.OPT_NAIVE_UTC)
+        
+        params: Dict[str, str] = {}
+        if isinstance(rows, list):
+            # Rows may omit different columns; listing them all makes PostgREST
+            # treat a missing key as null instead of going by the first row
+            params["columns"] = ",".join(_unique_columns(rows))
+        if on_conflict:
+            params["on_conflict"] = on_conflict
+            headers = self._upsert_headers[ignore_duplicates]
+        else:
+            headers = self._rest_headers
+        
+        try:
+            async with self._connection_slot(), self.http_session.post(
+                url, data=body, params=params, headers=headers, timeout=self._rest_timeout
+            ) as response:
+                if response.status >= 500:
+                    raise RetryableError(f"Insert into {table_name} failed with status {response.status}")
+                if response.status >= 400:
+                    detail = await response.text()
+                    raise NonRetryableError(f"Insert into {table_name} failed with status {response.status}: {detail}")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise RetryableError(f"Insert into {table_name} failed: {e}") from e
+    
+    async def _upsert_rows(
+        self,
+        table: str,
+        rows: Union[Dict[str, Any], List[Dict[str, Any]]],
+        on_conflict: str,
+        operation_name: str,
+        ignore_duplicates: bool = False
+    ) -> None:
+        """
+        Upsert rows, encoding them with orjson and POSTing directly when possible.
+        
+        Args:
+            table: Key of the target table in table_names
+            rows: Row or rows to upsert
+            on_conflict: Comma-separated conflict columns
+            operation_name: Name of the operation for logging
+            ignore_duplicates: Skip conflicting rows instead of merging them
+        """
+        if self.http_session is not None and orjson is not None:
+            await self._post_rows(
+                self.table_names[table],
+                rows,
+                on_conflict=on_conflict,
+                ignore_duplicates=ignore_duplicates
+            )
+            return
+        
+        def operation(client: AsyncClient) -> Any:
+            return self._tables[table].upsert(
+                rows,
+                on_conflict=on_conflict,
+                ignore_duplicates=ignore_duplicates
+            )
+        
+        await self._execute_with_retry(operation, operation_name)
     
     async def get_checkpoint(
         self, 
@@ -353,8 +998,12 @@ class SupabaseManager:
             CheckpointModel if found, None otherwise
         """
         try:
-            def operation(client: Client) -> Any:
-                query = client.table(self.table_names["checkpoints"]).select("*")
+            # Write out any pending update first so the read is not stale
+            if f"{checkpoint_type}_{chat_id or 'global'}" in self._pending_checkpoints:
+                await self._flush_checkpoints()
+            
+            def operation(client: AsyncClient) -> Any:
+                query = self._tables["checkpoints"].select("*")
                 
                 # Build query conditions
                 query = query.eq("checkpoint_type", checkpoint_type)
@@ -394,6 +1043,9 @@ class SupabaseManager:
         """
         Update or create a checkpoint in the database.
         
+        Updates are merged into the pending checkpoint and written in the
+        background, so rapid successive updates become a single upsert.
+        
         Args:
             checkpoint_type: Type of checkpoint
             last_processed_id: ID of last processed item
@@ -403,67 +1055,129 @@ class SupabaseManager:
             backfill_in_progress: Whether backfill is in progress
             
         Returns:
-            True if successful, False otherwise
+            True if the update was queued, False otherwise
         """
         try:
-            # Generate checkpoint ID
-            checkpoint_id = f"{checkpoint_type}_{chat_id or 'global'}"
+            # Only the fields given are set, so the upsert leaves the other
+            # columns of an existing row alone and lets defaults fill a new one
+            fields: Dict[str, Any] = {
+                "checkpoint_id": f"{checkpoint_type}_{chat_id or 'global'}",
+                "checkpoint_type": checkpoint_type,
+                "chat_id": chat_id,
+                "updated_at": datetime.now(timezone.utc),
+            }
+            if last_processed_id is not None:
+                fields["last_processed_id"] = last_processed_id
+            if last_processed_timestamp is not None:
+                fields["last_processed_timestamp"] = last_processed_timestamp
+            if total_processed is not None:
+                fields["total_processed"] = total_processed
+            if backfill_in_progress is not None:
+                fields["backfill_in_progress"] = backfill_in_progress
+            
+            checkpoint_model = CheckpointModel(**fields)
+            checkpoint_dict = {
+                key: value
+                for key, value in self._model_to_dict(checkpoint_model).items()
+                if key in checkpoint_model.model_fields_set
+            }
+            
+            self._pending_checkpoints.setdefault(checkpoint_model.checkpoint_id, {}).update(checkpoint_dict)
+            
+            if self._checkpoint_flush_task is None:
+                self._checkpoint_flush_stop.clear()
+                self._checkpoint_flush_task = asyncio.create_task(self._checkpoint_flush_loop())
+            
+            logger.debug(f"Queued checkpoint {checkpoint_type} update for chat {chat_id}")
+            return True
             
-            # Check if checkpoint exists
-            existing = await self.get_checkpoint(checkpoint_type, chat_id)
+        except Exception as e:
+            logger.error(f"Failed to update checkpoint {checkpoint_type}: {e}")
+            return False
+    
+    async def _checkpoint_flush_loop(self) -> None:
+        """Periodically write pending checkpoint updates until close() asks it to stop."""
+        while not self._checkpoint_flush_stop.is_set():
+            try:
+                await asyncio.wait_for(self._checkpoint_flush_stop.wait(), _CHECKPOINT_FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
             
-            if existing:
-                # Update existing checkpoint
-                update_data: Dict[str, Union[str, int, bool]] = {
-                    "updated_at": datetime.now(timezone.utc).isoformat()
-                }
-                
-                if last_processed_id is not None:
-                    update_data["last_processed_id"] = last_processed_id
-                if last_processed_timestamp is not None:
-                    update_data["last_processed_timestamp"] = last_processed_timestamp.isoformat()
-                if total_processed is not None:
-                    update_data["total_processed"] = total_processed
-                if backfill_in_progress is not None:
-                    update_data["backfill_in_progress"] = backfill_in_progress
-                
-                def operation(client: Client) -> Any:
-                    query = client.table(self.table_names["checkpoints"]).update(update_data)
-                    return query.eq("checkpoint_id", existing.checkpoint_id)
-                
-            else:
-                # Create new checkpoint
-                checkpoint_model = CheckpointModel(
-                    checkpoint_id=checkpoint_id,
-                    checkpoint_type=checkpoint_type,
-                    chat_id=chat_id,
-                    last_processed_id=last_processed_id,
-                    last_processed_timestamp=last_processed_timestamp,
-                    total_processed=total_processed or 0,
-                    last_backfill_completed=None,  # Set explicitly
-                    backfill_in_progress=backfill_in_progress or False
+            if self._pending_checkpoints:
+                await self._flush_checkpoints()
+        
+        # Write updates queued while the last flush was in flight
+        if self._pending_checkpoints:
+            await self._flush_checkpoints()
+    
+    async def _flush_checkpoints(self) -> None:
+        """
+        Upsert all pending checkpoint updates.
+        
+        Rows are grouped by the columns they set, since a bulk upsert would
+        otherwise null out columns missing from some rows. Failed rows are put
+        back, under any newer update, to be retried on the next flush.
+        """
+        pending, self._pending_checkpoints = self._pending_checkpoints, {}
+        
+        groups: Dict[FrozenSet[str], List[Dict[str, Any]]] = {}
+        for row in pending.values():
+            groups.setdefault(frozenset(row), []).append(row)
+        
+        for rows in groups.values():
+            try:
+                await self._upsert_rows(
+                    "checkpoints",
+                    rows,
+                    "checkpoint_id",
+                    f"update_checkpoints_{len(rows)}"
                 )
-                
-                checkpoint_dict = self._checkpoint_model_to_dict(checkpoint_model)
-                
-                def operation(client: Client) -> Any:
-                    return client.table(self.table_names["checkpoints"]).upsert(
-                        checkpoint_dict,
-                        on_conflict="checkpoint_id"
-                    )
-            
-            await self._execute_with_retry(
-                operation,
-                f"update_checkpoint_{checkpoint_type}"
-            )
-            
-            logger.debug(f"Updated checkpoint {checkpoint_type} for chat {chat_id}")
+                logger.debug(f"Wrote {len(rows)} checkpoint updates")
+            except Exception as e:
+                logger.error(f"Failed to write {len(rows)} checkpoint updates: {e}")
+                for row in rows:
+                    newer = self._pending_checkpoints.get(row["checkpoint_id"], {})
+                    self._pending_checkpoints[row["checkpoint_id"]] = {**row, **newer}
+    
+    async def health_check(self) -> bool:
+        """
+        Check whether the database is reachable.
+        
+        The check is a single attempt bounded by health_check_timeout, so a
+        probe reports an outage promptly instead of waiting out the retries.
+        
+        Returns:
+            True if the health_ping function (or, where it is not installed, a
+            single-row checkpoint query) succeeds in time, False otherwise
+        """
+        try:
+            await asyncio.wait_for(self._ping(), timeout=self.config.health_check_timeout)
             return True
             
+        except asyncio.TimeoutError:
+            logger.warning(f"Database health check timed out after {self.config.health_check_timeout}s")
+            return False
         except Exception as e:
-            logger.error(f"Failed to update checkpoint {checkpoint_type}: {e}")
+            logger.warning(f"Database health check failed: {e}")
             return False
     
+    async def _ping(self) -> None:
+        """Run one health query without retries."""
+        if self._health_rpc_available:
+            try:
+                await self._execute(_call_function, "health_check", "health_ping", {})
+                return
+            except DatabaseError as e:
+                if not (isinstance(e.__cause__, APIError) and e.__cause__.code == _FUNCTION_NOT_FOUND):
+                    raise
+                logger.warning("health_ping function not found; checking the checkpoints table instead")
+                self._health_rpc_available = False
+        
+        def operation(client: AsyncClient) -> Any:
+            return self._tables["checkpoints"].select("checkpoint_id").limit(1)
+        
+        await self._execute(operation, "health_check")
+    
     async def get_last_message_id(
         self, 
         chat_id: int
@@ -478,8 +1192,8 @@ class SupabaseManager:
             Message ID if found, None otherwise
         """
         try:
-            def operation(client: Client) -> Any:
-                query = client.table(self.table_names["messages"]).select("message_id")
+            def operation(client: AsyncClient) -> Any:
+                query = self._tables["messages"].select("message_id")
                 query = query.eq("chat_id", chat_id)
                 return query.order("date", desc=True).limit(1)
             
@@ -507,42 +1221,19 @@ class SupabaseManager:
             True if successful, False otherwise
         """
         try:
-            chat_model = ChatInfoModel(
-                chat_id=chat.id,
-                chat_type=ChatType(str(chat.type)),
-                title=getattr(chat, 'title', None),
-                username=getattr(chat, 'username', None),
-                first_name=getattr(chat, 'first_name', None),
-                last_name=getattr(chat, 'last_name', None),
-                bio=getattr(chat, 'bio', None),
-                description=getattr(chat, 'description', None),
-                invite_link=getattr(chat, 'invite_link', None),
-                slow_mode_delay=getattr(chat, 'slow_mode_delay', None),
-                message_auto_delete_time=getattr(chat, 'message_auto_delete_time', None),
-                has_protected_content=getattr(chat, 'has_protected_content', None),
-                has_private_forwards=getattr(chat, 'has_private_forwards', None),
-                has_restricted_voice_and_video_messages=getattr(chat, 'has_restricted_voice_and_video_messages', None),
-                join_to_send_messages=getattr(chat, 'join_to_send_messages', None),
-                join_by_request=getattr(chat, 'join_by_request', None),
-                is_forum=getattr(chat, 'is_forum', None),
-                active_usernames=getattr(chat, 'active_usernames', None),
-                emoji_status_custom_emoji_id=getattr(chat, 'emoji_status_custom_emoji_id', None),
-                has_hidden_members=getattr(chat, 'has_hidden_members', None),
-                has_aggressive_anti_spam_enabled=getattr(chat, 'has_aggressive_anti_spam_enabled', None)
-            )
+            signature = self._chat_signature(chat)
+            if self._is_unchanged(self._chat_signatures, chat.id, signature):
+                return True
             
-            chat_dict = self._chat_info_model_to_dict(chat_model)
+            chat_dict = self._model_to_dict(self._convert_telegram_chat(chat))
             
-            def operation(client: Client) -> Any:
-                return client.table(self.table_names["chats"]).upsert(
-                    chat_dict,
-                    on_conflict="chat_id"
-                )
-            
-            await self._execute_with_retry(
-                operation,
+            await self._upsert_rows(
+                "chats",
+                chat_dict,
+                "chat_id",
                 f"store_chat_info_{chat.id}"
             )
+            self._remember_signature(self._chat_signatures, chat.id, signature)
             
             logger.debug(f"Stored chat info for {chat.title or chat.username} ({chat.id})")
             return True
@@ -551,44 +1242,76 @@ class SupabaseManager:
             logger.error(f"Failed to store chat info for {chat.id}: {e}")
             return False
     
+    async def store_chats_batch(self, chats: List[Chat]) -> int:
+        """
+        Store or update information for multiple chats in a single batch operation.
+        
+        Args:
+            chats: List of Telegram chat objects with unique IDs
+            
+        Returns:
+            Number of chats stored or already up to date
+        """
+        if not chats:
+            return 0
+        
+        try:
+            changed = [
+                (chat, signature) for chat in chats
+                if not self._is_unchanged(
+                    self._chat_signatures, chat.id, signature := self._chat_signature(chat)
+                )
+            ]
+            if not changed:
+                return len(chats)
+            
+            now = datetime.now(timezone.utc)
+            chat_dicts = [
+                self._model_to_dict(self._convert_telegram_chat(chat, now))
+                for chat, _ in changed
+            ]
+            
+            await self._upsert_rows(
+                "chats",
+                chat_dicts,
+                "chat_id",
+                f"store_chats_batch_{len(chat_dicts)}"
+            )
+            for chat, signature in changed:
+                self._remember_signature(self._chat_signatures, chat.id, signature)
+            
+            logger.debug(f"Stored batch of {len(chat_dicts)} chats")
+            return len(chats)
+            
+        except Exception as e:
+            logger.error(f"Failed to store chat batch of {len(chats)}: {e}")
+            return 0
+    
     async def store_user_info(self, user: User, avatar_url: Optional[str] = None) -> bool:
         """
         Store or update user information.
         
         Args:
             user: Telegram user object
+            avatar_url: URL of the user's profile picture
             
         Returns:
             True if successful, False otherwise
         """
         try:
-            user_model = UserInfoModel(
-                user_id=user.id,
-                is_bot=user.is_bot,
-                first_name=user.first_name,
-                last_name=user.last_name,
-                username=user.username,
-                language_code=user.language_code,
-                is_premium=getattr(user, 'is_premium', None),
-                added_to_attachment_menu=getattr(user, 'added_to_attachment_menu', None),
-                can_join_groups=getattr(user, 'can_join_groups', None),
-                can_read_all_group_messages=getattr(user, 'can_read_all_group_messages', None),
-                supports_inline_queries=getattr(user, 'supports_inline_queries', None),
-                avatar_url=avatar_url
-            )
+            signature = self._user_signature(user, avatar_url)
+            if self._is_unchanged(self._user_signatures, user.id, signature):
+                return True
             
-            user_dict = self._user_info_model_to_dict(user_model)
+            user_dict = self._model_to_dict(self._convert_telegram_user(user, avatar_url))
             
-            def operation(client: Client) -> Any:
-                return client.table(self.table_names["users"]).upsert(
-                    user_dict,
-                    on_conflict="user_id"
-                )
-            
-            await self._execute_with_retry(
-                operation,
+            await self._upsert_rows(
+                "users",
+                user_dict,
+                "user_id",
                 f"store_user_info_{user.id}"
             )
+            self._remember_signature(self._user_signatures, user.id, signature)
             
             logger.debug(f"Stored user info for {user.username or user.first_name} ({user.id})")
             return True
@@ -597,72 +1320,196 @@ class SupabaseManager:
             logger.error(f"Failed to store user info for {user.id}: {e}")
             return False
     
-    def _convert_telegram_message(self, message: Message, is_backfilled: bool = False) -> MessageModel:
+    async def store_users_batch(
+        self,
+        users: List[User],
+        avatar_urls: Optional[Dict[int, Optional[str]]] = None
+    ) -> int:
+        """
+        Store or update information for multiple users in a single batch operation.
+        
+        Args:
+            users: List of Telegram user objects with unique IDs
+            avatar_urls: Profile picture URLs keyed by user ID
+            
+        Returns:
+            Number of users stored or already up to date
+        """
+        if not users:
+            return 0
+        
+        avatar_urls = avatar_urls or {}
+        
+        try:
+            changed = [
+                (user, signature) for user in users
+                if not self._is_unchanged(
+                    self._user_signatures,
+                    user.id,
+                    signature := self._user_signature(user, avatar_urls.get(user.id))
+                )
+            ]
+            if not changed:
+                return len(users)
+            
+            now = datetime.now(timezone.utc)
+            user_dicts = [
+                self._model_to_dict(
+                    self._convert_telegram_user(user, avatar_urls.get(user.id), now)
+                )
+                for user, _ in changed
+            ]
+            
+            await self._upsert_rows(
+                "users",
+                user_dicts,
+                "user_id",
+                f"store_users_batch_{len(user_dicts)}"
+            )
+            for user, signature in changed:
+                self._remember_signature(self._user_signatures, user.id, signature)
+            
+            logger.debug(f"Stored batch of {len(user_dicts)} users")
+            return len(users)
+            
+        except Exception as e:
+            logger.error(f"Failed to store user batch of {len(users)}: {e}")
+            return 0
+    
+    def _chat_signature(self, chat: Chat) -> int:
+        """Hash the chat attributes that are stored in the chats table."""
+        return hash(tuple(getattr(chat, attr, None) for attr in _CHAT_SIGNATURE_ATTRS))
+    
+    def _user_signature(self, user: User, avatar_url: Optional[str] = None) -> int:
+        """Hash the user attributes that are stored in the users table."""
+        return hash((avatar_url, *(getattr(user, attr, None) for attr in _USER_SIGNATURE_ATTRS)))
+    
+    def _is_unchanged(self, signatures: "OrderedDict[int, int]", entity_id: int, signature: int) -> bool:
+        """
+        Check whether an entity was last stored with the same signature.
+        
+        Args:
+            signatures: Mapping of entity ID to its last stored signature
+            entity_id: Chat or user ID
+            signature: Signature of the entity's current attributes
+            
+        Returns:
+            True if the stored row is already up to date
+        """
+        if signatures.get(entity_id) != signature:
+            return False
+        signatures.move_to_end(entity_id)
+        return True
+    
+    def _remember_signature(self, signatures: "OrderedDict[int, int]", entity_id: int, signature: int) -> None:
+        """Record a stored signature, evicting the least recently used entry once full."""
+        signatures[entity_id] = signature
+        signatures.move_to_end(entity_id)
+        if len(signatures) > _MAX_INFO_SIGNATURES:
+            signatures.popitem(last=False)
+    
+    def _convert_telegram_chat(self, chat: Chat, now: Optional[datetime] = None) -> ChatInfoModel:
+        """
+        Convert a Telegram chat to a ChatInfoModel for database storage.
+        
+        Args:
+            chat: Telegram chat object
+            now: Timestamp shared by a batch; defaults to the current time
+            
+        Returns:
+            ChatInfoModel instance ready for database storage
+        """
+        now = now or datetime.now(timezone.utc)
+        return ChatInfoModel(
+            chat_id=chat.id,
+            chat_type=ChatType(str(chat.type)),
+            title=getattr(chat, 'title', None),
+            username=getattr(chat, 'username', None),
+            first_name=getattr(chat, 'first_name', None),
+            last_name=getattr(chat, 'last_name', None),
+            bio=getattr(chat, 'bio', None),
+            description=getattr(chat, 'description', None),
+            invite_link=getattr(chat, 'invite_link', None),
+            slow_mode_delay=getattr(chat, 'slow_mode_delay', None),
+            message_auto_delete_time=getattr(chat, 'message_auto_delete_time', None),
+            has_protected_content=getattr(chat, 'has_protected_content', None),
+            has_private_forwards=getattr(chat, 'has_private_forwards', None),
+            has_restricted_voice_and_video_messages=getattr(chat, 'has_restricted_voice_and_video_messages', None),
+            join_to_send_messages=getattr(chat, 'join_to_send_messages', None),
+            join_by_request=getattr(chat, 'join_by_request', None),
+            is_forum=getattr(chat, 'is_forum', None),
+            active_usernames=getattr(chat, 'active_usernames', None),
+            emoji_status_custom_emoji_id=getattr(chat, 'emoji_status_custom_emoji_id', None),
+            has_hidden_members=getattr(chat, 'has_hidden_members', None),
+            has_aggressive_anti_spam_enabled=getattr(chat, 'has_aggressive_anti_spam_enabled', None),
+            first_seen=now,
+            last_updated=now
+        )
+    
+    def _convert_telegram_user(
+        self,
+        user: User,
+        avatar_url: Optional[str] = None,
+        now: Optional[datetime] = None
+    ) -> UserInfoModel:
+        """
+        Convert a Telegram user to a UserInfoModel for database storage.
+        
+        Args:
+            user: Telegram user object
+            avatar_url: URL of the user's profile picture
+            now: Timestamp shared by a batch; defaults to the current time
+            
+        Returns:
+            UserInfoModel instance ready for database storage
+        """
+        now = now or datetime.now(timezone.utc)
+        return UserInfoModel(
+            user_id=user.id,
+            is_bot=user.is_bot,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            username=user.username,
+            language_code=user.language_code,
+            is_premium=getattr(user, 'is_premium', None),
+            added_to_attachment_menu=getattr(user, 'added_to_attachment_menu', None),
+            can_join_groups=getattr(user, 'can_join_groups', None),
+            can_read_all_group_messages=getattr(user, 'can_read_all_group_messages', None),
+            supports_inline_queries=getattr(user, 'supports_inline_queries', None),
+            avatar_url=avatar_url,
+            first_seen=now,
+            last_updated=now
+        )
+    
+    def _convert_telegram_message(
+        self,
+        message: Message,
+        is_backfilled: bool = False,
+        logged_at: Optional[datetime] = None
+    ) -> MessageModel:
         """
         Convert a Telegram message to a MessageModel for database storage.
         
         Args:
             message: Telegram message object
             is_backfilled: Whether this message is being backfilled
+            logged_at: Timestamp shared by a batch; defaults to the current time
             
         Returns:
             MessageModel instance ready for database storage
         """
         # Determine message type and text content
         message_text = message.text
-        message_type = MessageType.TEXT # Default to TEXT
-
-        if message.photo:
-            message_type = MessageType.PHOTO
-            if message.caption:
-                message_text = message.caption
-        elif message.video:
-            message_type = MessageType.VIDEO
-            if message.caption:
-                message_text = message.caption
-        elif message.audio:
-            message_type = MessageType.AUDIO
-            if message.caption:
-                message_text = message.caption
-        elif message.document:
-            message_type = MessageType.DOCUMENT
-            if message.caption:
-                message_text = message.caption
-        elif message.voice:
-            message_type = MessageType.VOICE
-            if message.caption:
-                message_text = message.caption
-        elif message.video_note:
-            message_type = MessageType.VIDEO_NOTE
-            if message.caption:
-                message_text = message.caption
-        elif message.sticker:
-            message_type = MessageType.STICKER
-            # Stickers don't usually have text, but if they do, it's in message.text
-        elif message.animation:
-            message_type = MessageType.ANIMATION
-            if message.caption:
-                message_text = message.caption
-        elif message.contact:
-            message_type = MessageType.CONTACT
-        elif message.dice:
-            message_type = MessageType.DICE
-        elif message.game:
-            message_type = MessageType.GAME
-        elif message.poll:
-            message_type = MessageType.POLL
-        elif message.venue:
-            message_type = MessageType.VENUE
-        elif message.location:
-            message_type = MessageType.LOCATION
-        elif message.invoice:
-            message_type = MessageType.INVOICE
-        elif message.successful_payment:
-            message_type = MessageType.SUCCESSFUL_PAYMENT
-        elif message.web_app_data:
-            message_type = MessageType.WEB_APP_DATA
-        # Add other message types as needed
-
+        message_type = MessageType.TEXT  # Default to TEXT
+        
+        for attr, attr_type in _MESSAGE_TYPE_ATTRS:
+            if getattr(message, attr):
+                message_type = attr_type
+                break
+        
+        if message_type in _CAPTIONED_MESSAGE_TYPES and message.caption:
+            message_text = message.caption
+        
         # Handle attachments (existing logic)
         attachments = []
         if message.document:
@@ -672,20 +1519,21 @@ class SupabaseManager:
                 file_name=message.document.file_name,
                 mime_type=message.document.mime_type,
                 file_size=message.document.file_size,
-                thumb=message.document.thumb.to_dict() if message.document.thumb else None
+                thumb=message.document.thumbnail.to_dict() if message.document.thumbnail else None
             ))
         
+        from_user = message.from_user
         return MessageModel(
             message_id=message.message_id,
             chat_id=message.chat.id,
-            from_user_id=message.from_user.id if message.from_user else None,
+            from_user_id=from_user.id if from_user else None,
             text=message_text, # Use message_text here
             message_type=message_type, # Use determined message_type
-            from_user_username=message.from_user.username if message.from_user else None,
-            from_user_first_name=message.from_user.first_name if message.from_user else None,
-            from_user_last_name=message.from_user.last_name if message.from_user else None,
-            from_user_is_bot=message.from_user.is_bot if message.from_user else False,
-            from_user_language_code=message.from_user.language_code if message.from_user else None,
+            from_user_username=from_user.username if from_user else None,
+            from_user_first_name=from_user.first_name if from_user else None,
+            from_user_last_name=from_user.last_name if from_user else None,
+            from_user_is_bot=from_user.is_bot if from_user else False,
+            from_user_language_code=from_user.language_code if from_user else None,
             date=message.date,
             edit_date=message.edit_date,
             forward_from_user_id=message.forward_from.id if message.forward_from else None,
@@ -695,31 +1543,31 @@ class SupabaseManager:
             forward_sender_name=message.forward_sender_name,
             forward_date=message.forward_date,
             reply_to_message_id=message.reply_to_message.message_id if message.reply_to_message else None,
-            reply_to_message=message.reply_to_message.to_dict() if message.reply_to_message else None,
+            reply_to_message=_opt_dict(message.reply_to_message),
             attachments=attachments,
-            entities=[entity.to_dict() for entity in message.entities] if message.entities else [],
-            caption_entities=[entity.to_dict() for entity in message.caption_entities] if message.caption_entities else [],
-            photo=[photo.to_dict() for photo in message.photo] if message.photo else None,
-            audio=message.audio.to_dict() if message.audio else None,
-            document=message.document.to_dict() if message.document else None,
-            video=message.video.to_dict() if message.video else None,
-            voice=message.voice.to_dict() if message.voice else None,
-            video_note=message.video_note.to_dict() if message.video_note else None,
-            sticker=message.sticker.to_dict() if message.sticker else None,
-            animation=message.animation.to_dict() if message.animation else None,
-            contact=message.contact.to_dict() if message.contact else None,
-            dice=message.dice.to_dict() if message.dice else None,
-            game=message.game.to_dict() if message.game else None,
-            poll=message.poll.to_dict() if message.poll else None,
-            venue=message.venue.to_dict() if message.venue else None,
-            location=message.location.to_dict() if message.location else None,
-            invoice=message.invoice.to_dict() if message.invoice else None,
-            successful_payment=message.successful_payment.to_dict() if message.successful_payment else None,
-            web_app_data=message.web_app_data.to_dict() if message.web_app_data else None,
-            new_chat_members=[member.to_dict() for member in message.new_chat_members] if message.new_chat_members else None,
-            left_chat_member=message.left_chat_member.to_dict() if message.left_chat_member else None,
+            entities=_opt_dict_list(message.entities) or [],
+            caption_entities=_opt_dict_list(message.caption_entities) or [],
+            photo=_opt_dict_list(message.photo),
+            audio=_opt_dict(message.audio),
+            document=_opt_dict(message.document),
+            video=_opt_dict(message.video),
+            voice=_opt_dict(message.voice),
+            video_note=_opt_dict(message.video_note),
+            sticker=_opt_dict(message.sticker),
+            animation=_opt_dict(message.animation),
+            contact=_opt_dict(message.contact),
+            dice=_opt_dict(message.dice),
+            game=_opt_dict(message.game),
+            poll=_opt_dict(message.poll),
+            venue=_opt_dict(message.venue),
+            location=_opt_dict(message.location),
+            invoice=_opt_dict(message.invoice),
+            successful_payment=_opt_dict(message.successful_payment),
+            web_app_data=_opt_dict(message.web_app_data),
+            new_chat_members=_opt_dict_list(message.new_chat_members),
+            left_chat_member=_opt_dict(message.left_chat_member),
             new_chat_title=getattr(message, 'new_chat_title', None),
-            new_chat_photo=[photo.to_dict() for photo in message.new_chat_photo] if message.new_chat_photo else None,
+            new_chat_photo=_opt_dict_list(message.new_chat_photo),
             delete_chat_photo=getattr(message, 'delete_chat_photo', None),
             group_chat_created=getattr(message, 'group_chat_created', None),
             supergroup_chat_created=getattr(message, 'supergroup_chat_created', None),
@@ -727,71 +1575,103 @@ class SupabaseManager:
             message_auto_delete_time=getattr(message, 'message_auto_delete_time', None),
             migrate_to_chat_id=getattr(message, 'migrate_to_chat_id', None),
             migrate_from_chat_id=getattr(message, 'migrate_from_chat_id', None),
-            pinned_message=message.pinned_message.to_dict() if message.pinned_message else None,
-            reply_markup=message.reply_markup.to_dict() if message.reply_markup else None,
-            is_backfilled=is_backfilled
+            pinned_message=_opt_dict(message.pinned_message),
+            reply_markup=_opt_dict(message.reply_markup),
+            is_backfilled=is_backfilled,
+            logged_at=logged_at or datetime.now(timezone.utc)
         )
     
-    @lru_cache(maxsize=128)
-    def _get_cached_stats_key(self, stat_type: str) -> str:
-        """Generate cache key for statistics."""
-        return f"stats_{stat_type}_{int(datetime.now(timezone.utc).timestamp() // self._cache_ttl)}"
-    
-    async def get_statistics(self) -> Dict[str, Any]:
+    async def get_statistics(self, exact: bool = False) -> Dict[str, Any]:
         """
         Get database statistics with caching.
         
+        Row counts come from the planner's estimates, fetched for all tables in
+        a single call, unless exact counts are requested; small tables are
+        always counted exactly, concurrently.
+        
+        Args:
+            exact: Count every row instead of using estimates
+            
         Returns:
             Dictionary containing database statistics
         """
+        cached = self._stats_caches.get(exact)
+        
         try:
             # Check cache validity
-            now = datetime.now(timezone.utc)
-            if (now - self._last_cache_update).total_seconds() < self._cache_ttl and self._stats_cache:
-                return self._stats_cache
+            if cached and time.monotonic() < cached[0]:
+                return cached[1]
             
-            stats = {}
+            estimates = {} if exact else await self._estimate_row_counts()
             
-            # Get message count
-            def get_message_count(client: Client) -> Any:
-                return client.table(self.table_names["messages"]).select("id", count="exact")
-            
-            result = await self._execute_with_retry(
-                get_message_count,
-                "get_message_count"
-            )
-            stats["total_messages"] = result.count
-            
-            # Get action count
-            def get_action_count(client: Client) -> Any:
-                return client.table(self.table_names["actions"]).select("id", count="exact")
-            
-            result = await self._execute_with_retry(
-                get_action_count,
-                "get_action_count"
-            )
-            stats["total_actions"] = result.count
-            
-            # Get chat count
-            def get_chat_count(client: Client) -> Any:
-                return client.table(self.table_names["chats"]).select("id", count="exact")
+            stats = {}
+            to_count = []
+            for stat, table in _STATS_TABLES:
+                estimate = estimates.get(table)
+                # Estimates are unreliable for small or never-analyzed tables,
+                # which are cheap to count exactly anyway
+                if estimate is not None and estimate >= _EXACT_COUNT_THRESHOLD:
+                    stats[stat] = estimate
+                else:
+                    to_count.append((stat, table))
             
-            result = await self._execute_with_retry(
-                get_chat_count,
-                "get_chat_count"
-            )
-            stats["total_chats"] = result.count
+            # The exact counts are independent, so run them concurrently
+            counts = await asyncio.gather(*[self._count_rows(table) for _, table in to_count])
+            for (stat, _), count in zip(to_count, counts):
+                stats[stat] = count
             
             # Update cache
-            self._stats_cache = stats
-            self._last_cache_update = now
+            self._stats_caches[exact] = (time.monotonic() + self._stats_cache_ttls[exact], stats)
             
             return stats
             
         except Exception as e:
             logger.error(f"Failed to get database statistics: {e}")
-            return self._stats_cache if self._stats_cache else {}
+            return cached[1] if cached else {}
     
+    async def _estimate_row_counts(self) -> Dict[str, Optional[int]]:
+        """
+        Fetch the planner's row estimates for the statistics tables in one round-trip.
+        
+        Falls back to PostgREST's planned counts, one request per table, when
+        the logger_stats function is not installed.
+        
+        Returns:
+            Estimated row counts keyed by table key
+        """
+        if self._stats_rpc_available:
+            params = {f"{table}_table": self.table_names[table] for _, table in _STATS_TABLES}
+            
+            try:
+                result = await self._execute_with_retry(
+                    _call_function, "get_row_estimates", "logger_stats", params
+                )
+                return result.data[0] if result.data else {}
+            except DatabaseError as e:
+                if not (isinstance(e.__cause__, APIError) and e.__cause__.code == _FUNCTION_NOT_FOUND):
+                    raise
+                logger.warning("logger_stats function not found; using planned counts for statistics")
+                self._stats_rpc_available = False
+        
+        tables = [table for _, table in _STATS_TABLES]
+        counts = await asyncio.gather(*[self._count_rows(table, "planned") for table in tables])
+        return dict(zip(tables, counts))
+    
+    async def _count_rows(self, table: str, method: str = "exact") -> Optional[int]:
+        """
+        Count the rows of a table without fetching them.
+        
+        Args:
+            table: Key of the table in table_names
+            method: PostgREST count method ("exact", "planned" or "estimated")
+            
+        Returns:
+            The row count
+        """
+        result = await self._execute_with_retry(
+            _count_query, f"get_{table}_count", self._tables[table], method
+        )
+        return result.count
     
     async def cleanup_old_data(self, days_to_keep: int = 90) -> Dict[str, int]:
         """
@@ -803,23 +1683,13 @@ class SupabaseManager:
         Returns:
             Dictionary with cleanup results
         """
-        cutoff_date = datetime.now(timezone.utc) - timedelta(days=days_to_keep)
+        # Formatted once so retried deletes use the same cutoff
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=days_to_keep)).isoformat()
         cleanup_results = {"messages_deleted": 0, "actions_deleted": 0}
         
         try:
-            # Cleanup old messages
-            def cleanup_messages(client: Client) -> Any:
-                return client.table(self.table_names["messages"]).delete().lt("date", cutoff_date.isoformat())
-            
-            result = await self._execute_with_retry(cleanup_messages, "cleanup_old_messages")
-            cleanup_results["messages_deleted"] = len(result.data) if result.data else 0
-            
-            # Cleanup old actions
-            def cleanup_actions(client: Client) -> Any:
-                return client.table(self.table_names["actions"]).delete().lt("occurred_at", cutoff_date.isoformat())
-            
-            result = await self._execute_with_retry(cleanup_actions, "cleanup_old_actions")
-            cleanup_results["actions_deleted"] = len(result.data) if result.data else 0
+            cleanup_results["messages_deleted"] = await self._delete_older_than("messages", "date", cutoff)
+            cleanup_results["actions_deleted"] = await self._delete_older_than("actions", "occurred_at", cutoff)
             
             logger.info(f"Cleaned up {cleanup_results['messages_deleted']} messages and {cleanup_results['actions_deleted']} actions")
             
@@ -828,13 +1698,82 @@ class SupabaseManager:
         
         return cleanup_results
     
+    async def _delete_older_than(self, table: str, time_column: str, cutoff: str) -> int:
+        """
+        Delete rows older than a cutoff in bounded batches.
+        
+        Uses the cleanup_batch function when installed, looping until a batch
+        comes back short; otherwise falls back to a single delete. Only the
+        number of deleted rows is returned by the database, never the rows.
+        
+        Args:
+            table: Key of the table in table_names
+            time_column: Timestamp column compared against the cutoff
+            cutoff: ISO timestamp; older rows are deleted
+            
+        Returns:
+            Number of rows deleted
+        """
+        deleted = 0
+        
+        if self._cleanup_rpc_available:
+            params = {
+                "tbl": self.table_names[table],
+                "time_column": time_column,
+                "cutoff": cutoff,
+                "batch_size": _CLEANUP_BATCH_SIZE,
+            }
+            
+            try:
+                while True:
+                    result = await self._execute_with_retry(
+                        _call_function, f"cleanup_old_{table}", "cleanup_batch", params
+                    )
+                    deleted += result.data or 0
+                    if (result.data or 0) < _CLEANUP_BATCH_SIZE:
+                        return deleted
+            except DatabaseError as e:
+                code = e.__cause__.code if isinstance(e.__cause__, APIError) else None
+                if code not in (_FUNCTION_NOT_FOUND, _FUNCTION_NOT_PERMITTED):
+                    raise
+                reason = "not found" if code == _FUNCTION_NOT_FOUND else "not permitted for this key"
+                logger.warning(f"cleanup_batch function {reason}; deleting old rows in a single statement")
+                self._cleanup_rpc_available = False
+        
+        result = await self._execute_with_retry(
+            _delete_older_query, f"cleanup_old_{table}", self._tables[table], time_column, cutoff
+        )
+        return deleted + (result.count or 0)
+    
     async def close(self) -> None:
         """Close the database connection."""
+        if self._message_flush_task is not None:
+            # Cancelling the flusher writes out any queued messages first
+            self._message_flush_task.cancel()
+            await asyncio.gather(self._message_flush_task, return_exceptions=True)
+            self._message_flush_task = None
+        
+        if self._checkpoint_flush_task is not None:
+            # Let the flusher finish any write in progress and flush what is left,
+            # rather than cancelling it with rows already taken off the pending map
+            self._checkpoint_flush_stop.set()
+            await asyncio.gather(self._checkpoint_flush_task, return_exceptions=True)
+            self._checkpoint_flush_task = None
+        
         if self.client:
             logger.info("Closing Supabase connection")
             # Supabase client doesn't need explicit closing
             self.client = None
+            self._tables = {}
             self._initialized = False
+        
+        if self._pg_pool is not None:
+            await self._pg_pool.close()
+            self._pg_pool = None
+        
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
     
     def _message_model_to_dict(self, message_model: MessageModel) -> Dict[str, Any]:
         """
@@ -844,150 +1783,30 @@ class SupabaseManager:
             message_model: The MessageModel to convert
             
         Returns:
-            Dictionary with datetime objects converted to ISO format strings
+            Dictionary with datetimes as ISO strings and enums as their values
         """
         try:
-            data = message_model.model_dump()
-            
-            # Remove fields that don't exist in the database schema
-            fields_to_remove = [
-                'connected_website',
-                'passport_data', 
-                'proximity_alert_triggered',
-                'video_chat_scheduled',
-                'video_chat_started',
-                'video_chat_ended',
-                'video_chat_participants_invited'
-            ]
-            
-            for field in fields_to_remove:
-                data.pop(field, None)
-            
-            # Recursively convert all datetime objects to strings
-            data = self._convert_datetime_recursive(data)
-            
-            # Convert enum values to strings
-            if 'message_type' in data:
-                if hasattr(data['message_type'], 'value'):
-                    data['message_type'] = data['message_type'].value
-                elif isinstance(data['message_type'], str):
-                    pass
-                else:
-                    data['message_type'] = 'text'
-            
-            return data
+            # Fields that don't exist in the database schema are left out, as are
+            # the many unset optional fields, which default to null anyway
+            return message_model.model_dump(
+                mode="json",
+                exclude=_MESSAGE_FIELDS_NOT_STORED,
+                exclude_none=True
+            )
             
         except Exception as e:
             logger.error(f"Error converting MessageModel to dict: {e}")
             raise
     
-    def _convert_datetime_recursive(self, obj: Any) -> Any:
+    def _model_to_dict(self, model: BaseModel) -> Dict[str, Any]:
         """
-        Recursively convert datetime objects to ISO format strings.
+        Convert a chat, user, checkpoint or action model to a JSON-serializable
+        dictionary for database storage.
         
         Args:
-            obj: The object to convert (can be dict, list, or any other type)
+            model: The model to convert
             
         Returns:
-            The object with all datetime objects converted to strings
-        """
-        if isinstance(obj, dict):
-            return {k: self._convert_datetime_recursive(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self._convert_datetime_recursive(item) for item in obj]
-        elif isinstance(obj, datetime):
-            return obj.isoformat()
-        elif hasattr(obj, 'isoformat') and callable(getattr(obj, 'isoformat')):
-            return obj.isoformat()
-        else:
-            return obj
-    
-    def _chat_info_model_to_dict(self, chat_model: ChatInfoModel) -> Dict[str, Any]:
+            Dictionary with datetimes as ISO strings and enums as their values
         """
-        Convert ChatInfoModel to a JSON-serializable dictionary for database storage.
-        
-        Args:
-            chat_model: The ChatInfoModel to convert
-            
-        Returns:
-            Dictionary with datetime objects converted to ISO format strings
-        """
-        data = chat_model.model_dump()
-        
-        # Convert datetime objects to ISO format strings
-        if data.get('first_seen'):
-            data['first_seen'] = data['first_seen'].isoformat()
-        if data.get('last_updated'):
-            data['last_updated'] = data['last_updated'].isoformat()
-        
-        # Convert enum values to strings
-        data['chat_type'] = data['chat_type'].value
-        
-        return data
-    
-    def _user_info_model_to_dict(self, user_model: UserInfoModel) -> Dict[str, Any]:
-        """
-        Convert UserInfoModel to a JSON-serializable dictionary for database storage.
-        
-        Args:
-            user_model: The UserInfoModel to convert
-            
-        Returns:
-            Dictionary with datetime objects converted to ISO format strings
-        """
-        data = user_model.model_dump()
-        
-        # Convert datetime objects to ISO format strings
-        if data.get('first_seen'):
-            data['first_seen'] = data['first_seen'].isoformat()
-        if data.get('last_updated'):
-            data['last_updated'] = data['last_updated'].isoformat()
-        
-        return data
-    
-    def _checkpoint_model_to_dict(self, checkpoint_model: CheckpointModel) -> Dict[str, Any]:
-        """
-        Convert CheckpointModel to a JSON-serializable dictionary for database storage.
-        
-        Args:
-            checkpoint_model: The CheckpointModel to convert
-            
-        Returns:
-            Dictionary with datetime objects converted to ISO format strings
-        """
-        data = checkpoint_model.model_dump()
-        
-        # Convert datetime objects to ISO format strings
-        if data.get('last_processed_timestamp'):
-            data['last_processed_timestamp'] = data['last_processed_timestamp'].isoformat()
-        if data.get('last_backfill_completed'):
-            data['last_backfill_completed'] = data['last_backfill_completed'].isoformat()
-        if data.get('created_at'):
-            data['created_at'] = data['created_at'].isoformat()
-        if data.get('updated_at'):
-            data['updated_at'] = data['updated_at'].isoformat()
-        
-        return data
-    
-    def _action_model_to_dict(self, action_model: ActionModel) -> Dict[str, Any]:
-        """
-        Convert ActionModel to a JSON-serializable dictionary for database storage.
-        
-        Args:
-            action_model: The ActionModel to convert
-            
-        Returns:
-            Dictionary with datetime objects converted to ISO format strings
-        """
-        data = action_model.model_dump()
-        
-        # Convert datetime objects to ISO format strings
-        if data.get('occurred_at'):
-            data['occurred_at'] = data['occurred_at'].isoformat()
-        if data.get('logged_at'):
-            data['logged_at'] = data['logged_at'].isoformat()
-        
-        # Convert enum values to strings
-        data['action_type'] = data['action_type'].value
-        
-        return data 
\ No newline at end of file
+        return model.model_dump(mode="json") 
\ No newline at end of file
@@ -9,6 +9,7 @@ to a Supabase database with comprehensive backfill and checkpoint capabilities.
 import asyncio
 import sys
 from pathlib import Path
+from typing import Callable, Coroutine, Optional
 
 # Add the src directory to the Python path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -24,7 +25,7 @@ async def main() -> None:
         print("Loading configuration...")
         config = load_config()
         print(f"Configuration loaded successfully")
-        print(f"Bot will connect to {len(config.allowed_chats_list) if config.allowed_chats_list else 'all'} chats")
+        print(f"Bot will connect to {len(config.allowed_chats) if config.allowed_chats else 'all'} chats")
         print(f"Backfill enabled: {config.backfill_enabled}")
         
         # Initialize and start bot
@@ -47,6 +48,29 @@ async def main() -> None:
         print("Bot shutdown complete")
 
 
+def run(entrypoint: Optional[Callable[[], Coroutine]] = None) -> None:
+    """
+    Run the bot, using uvloop as the event loop when it is installed.
+    
+    Args:
+        entrypoint: Coroutine function to run, defaults to main
+    """
+    entrypoint = entrypoint or main
+    try:
+        import uvloop
+    except ImportError:
+        # Fall back to the default asyncio event loop
+        asyncio.run(entrypoint())
+        return
+    
+    if sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            runner.run(entrypoint())
+    else:
+        uvloop.install()
+        asyncio.run(entrypoint())
+
+
 if __name__ == "__main__":
     # Run the bot
-    asyncio.run(main()) 
\ No newline at end of file
+    run() 
\ No newline at end of file
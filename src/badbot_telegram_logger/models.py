@@ -5,13 +5,19 @@ This module defines Pydantic models that represent the structure of data
 stored in the Supabase database for Telegram messages, actions, and processing checkpoints.
 """
 
-from datetime import datetime
+from dataclasses import dataclass
+from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Union
 from enum import Enum
 
 from pydantic import BaseModel, Field, ConfigDict
 
 
+def _utc_now() -> datetime:
+    """Return the current time as a timezone-aware UTC datetime."""
+    return datetime.now(timezone.utc)
+
+
 class ActionType(str, Enum):
     """Enumeration of Telegram action types that can be logged."""
     
@@ -104,9 +110,12 @@ class AttachmentModel(BaseModel):
 class MessageModel(BaseModel):
     """Model for Telegram messages stored in Supabase."""
     
+    # Built once from the Telegram payload and never mutated, so assignments
+    # and instances passed back into other models are not re-validated
     model_config = ConfigDict(
         str_strip_whitespace=True,
-        validate_assignment=True,
+        validate_assignment=False,
+        revalidate_instances="never",
         extra="forbid"
     )
     
@@ -177,8 +186,6 @@ class MessageModel(BaseModel):
     migrate_to_chat_id: Optional[int] = Field(None, description="Migrate to chat ID")
     migrate_from_chat_id: Optional[int] = Field(None, description="Migrate from chat ID")
     pinned_message: Optional[Dict[str, Any]] = Field(None, description="Pinned message")
-    invoice: Optional[Dict[str, Any]] = Field(None, description="Invoice information")
-    successful_payment: Optional[Dict[str, Any]] = Field(None, description="Successful payment")
     connected_website: Optional[str] = Field(None, description="Connected website")
     passport_data: Optional[Dict[str, Any]] = Field(None, description="Passport data")
     proximity_alert_triggered: Optional[Dict[str, Any]] = Field(None, description="Proximity alert")
@@ -186,11 +193,10 @@ class MessageModel(BaseModel):
     video_chat_started: Optional[Dict[str, Any]] = Field(None, description="Video chat started")
     video_chat_ended: Optional[Dict[str, Any]] = Field(None, description="Video chat ended")
     video_chat_participants_invited: Optional[Dict[str, Any]] = Field(None, description="Video chat participants invited")
-    web_app_data: Optional[Dict[str, Any]] = Field(None, description="Web app data")
     reply_markup: Optional[Dict[str, Any]] = Field(None, description="Reply markup")
     
     # Metadata
-    logged_at: datetime = Field(default_factory=datetime.utcnow, description="When message was logged to database")
+    logged_at: datetime = Field(default_factory=_utc_now, description="When message was logged to database")
     is_backfilled: bool = Field(False, description="Whether this message was backfilled")
 
 
@@ -226,10 +232,28 @@ class ActionModel(BaseModel):
     
     # Metadata
     occurred_at: datetime = Field(..., description="When the action occurred")
-    logged_at: datetime = Field(default_factory=datetime.utcnow, description="When action was logged to database")
+    logged_at: datetime = Field(default_factory=_utc_now, description="When action was logged to database")
     is_backfilled: bool = Field(False, description="Whether this action was backfilled")
 
 
+@dataclass(slots=True, frozen=True)
+class QueuedAction:
+    """Lightweight record for an action waiting in the bot's action queue."""
+    
+    action_type: ActionType
+    chat_id: Optional[int] = None
+    user_id: Optional[int] = None
+    username: Optional[str] = None
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    target_id: Optional[int] = None
+    target_type: Optional[str] = None
+    target_name: Optional[str] = None
+    action_data: Optional[Dict[str, Any]] = None
+    before_data: Optional[Dict[str, Any]] = None
+    after_data: Optional[Dict[str, Any]] = None
+
+
 class CheckpointModel(BaseModel):
     """Model for tracking processing checkpoints."""
     
@@ -254,8 +278,8 @@ class CheckpointModel(BaseModel):
     backfill_in_progress: bool = Field(False, description="Whether backfill is currently running")
     
     # Metadata
-    created_at: datetime = Field(default_factory=datetime.utcnow, description="When checkpoint was created")
-    updated_at: datetime = Field(default_factory=datetime.utcnow, description="When checkpoint was last updated")
+    created_at: datetime = Field(default_factory=_utc_now, description="When checkpoint was created")
+    updated_at: datetime = Field(default_factory=_utc_now, description="When checkpoint was last updated")
 
 
 class ChatInfoModel(BaseModel):
@@ -290,8 +314,8 @@ class ChatInfoModel(BaseModel):
     has_aggressive_anti_spam_enabled: Optional[bool] = Field(None, description="Has aggressive anti spam enabled")
     
     # Metadata
-    first_seen: datetime = Field(default_factory=datetime.utcnow, description="When bot first saw chat")
-    last_updated: datetime = Field(default_factory=datetime.utcnow, description="When chat info was last updated")
+    first_seen: datetime = Field(default_factory=_utc_now, description="When bot first saw chat")
+    last_updated: datetime = Field(default_factory=_utc_now, description="When chat info was last updated")
 
 
 class UserInfoModel(BaseModel):
@@ -317,5 +341,5 @@ class UserInfoModel(BaseModel):
     avatar_url: Optional[str] = Field(None, description="HTTP URL to the user's profile picture")
     
     # Metadata
-    first_seen: datetime = Field(default_factory=datetime.utcnow, description="When bot first saw user")
-    last_updated: datetime = Field(default_factory=datetime.utcnow, description="When user info was last updated") 
\ No newline at end of file
+    first_seen: datetime = Field(default_factory=_utc_now, description="When bot first saw user")
+    last_updated: datetime = Field(default_factory=_utc_now, description="When user info was last updated") 
\ No newline at end of file
@@ -0,0 +1,176 @@
+"""
+Tests for the Telegram Logger bot.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, PropertyMock, patch
+
+import pytest
+from telegram import Chat, Message, User
+from telegram.ext import Application
+
+from badbot_telegram_logger.bot import TelegramLogger
+from badbot_telegram_logger.config import Config
+
+
+def _make_message(message_id: int, user_id: int = 7) -> Message:
+    """Build a minimal text message in a single group chat."""
+    return Message(
+        message_id=message_id,
+        date=datetime.now(timezone.utc),
+        chat=Chat(id=-100123, type="supergroup", title="test"),
+        from_user=User(id=user_id, first_name="test", is_bot=False),
+        text="hello"
+    )
+
+
+def _make_bot(**overrides) -> TelegramLogger:
+    """Build a bot with valid settings and a mocked database manager."""
+    config = Config(
+        logger_telegram_token="1234567890:ABCdefGHIjklMNOpqrsTUVwxyz0123456789",
+        supabase_url="https://test.supabase.co",
+        supabase_key="k" * 120,
+        **overrides
+    )
+    bot = TelegramLogger(config)
+    bot.db_manager = MagicMock()
+    bot.db_manager.close = AsyncMock()
+    return bot
+
+
+@pytest.fixture
+def running_application():
+    """Make the bot's Application report itself running, without network calls."""
+    with patch.object(Application, "running", new_callable=PropertyMock, return_value=True), \
+            patch.object(Application, "stop", AsyncMock()), \
+            patch.object(Application, "shutdown", AsyncMock()):
+        yield
+
+
+class TestMessageWriter:
+    """Test cases for the background message writer."""
+    
+    @pytest.mark.asyncio
+    async def test_close_during_slow_store_keeps_messages(self, running_application):
+        """Test that closing the bot while a batch is being stored loses no messages."""
+        bot = _make_bot(BATCH_SIZE=5, FLUSH_INTERVAL=60)
+        
+        stored = []
+        store_started = asyncio.Event()
+        
+        async def slow_store(messages):
+            store_started.set()
+            await asyncio.sleep(0.2)
+            stored.extend(message.message_id for message in messages)
+            return len(messages)
+        
+        bot.db_manager.store_messages_batch = AsyncMock(side_effect=slow_store)
+        bot.db_manager.update_checkpoint = AsyncMock()
+        
+        bot._writer_task = asyncio.create_task(bot._message_writer_loop())
+        
+        for message_id in range(1, 11):
+            bot._queue_message(_make_message(message_id))
+        await asyncio.wait_for(store_started.wait(), timeout=1)
+        
+        # More messages arrive while the first batch is still being written
+        for message_id in range(11, 14):
+            bot._queue_message(_make_message(message_id))
+        
+        await bot.close()
+        
+        assert sorted(stored) == list(range(1, 14))
+        assert not bot.message_queue
+
+
+class TestInfoFlush:
+    """Test cases for the coalesced chat and user writer."""
+    
+    @pytest.mark.asyncio
+    async def test_close_during_slow_user_flush_keeps_users(self, running_application):
+        """Test that closing the bot while users are being written loses no users."""
+        bot = _make_bot(FLUSH_INTERVAL=1)
+        
+        stored = []
+        store_started = asyncio.Event()
+        
+        async def slow_store(users, avatar_urls):
+            store_started.set()
+            await asyncio.sleep(0.2)
+            stored.extend(user.id for user in users)
+            return True
+        
+        bot.db_manager.store_chats_batch = AsyncMock(return_value=True)
+        bot.db_manager.store_users_batch = AsyncMock(side_effect=slow_store)
+        bot._get_user_profile_photo_url = AsyncMock(return_value=None)
+        
+        bot._info_flush_task = asyncio.create_task(bot._info_flush_loop())
+        
+        await bot._store_chat_and_user_info(_make_message(1))
+        await asyncio.wait_for(store_started.wait(), timeout=2)
+        
+        # Another sender shows up while the first flush is still being written
+        await bot._store_chat_and_user_info(_make_message(2, user_id=8))
+        
+        await bot.close()
+        
+        assert sorted(stored) == [7, 8]
+
+
+class TestHealthEndpoint:
+    """Test cases for the /health endpoint."""
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_probes_share_one_check(self, running_application):
+        """Test that probes within the cache window reuse one database check."""
+        bot = _make_bot(HEALTH_CACHE_SECONDS=60)
+        bot.db_manager.health_check = AsyncMock(return_value=True)
+        
+        responses = await asyncio.gather(*[bot._health_handler(MagicMock()) for _ in range(5)])
+        
+        assert [response.status for response in responses] == [200] * 5
+        assert bot.db_manager.health_check.await_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_database_down_returns_503(self, running_application):
+        """Test that a failed database check makes /health return 503."""
+        bot = _make_bot()
+        bot.db_manager.health_check = AsyncMock(return_value=False)
+        
+        response = await bot._health_handler(MagicMock())
+        
+        assert response.status == 503
+
+
+class TestBatchThreshold:
+    """Test cases for the adaptive flush threshold."""
+    
+    @pytest.mark.parametrize("threshold,drained,expected", [
+        (5, 5, 10),      # full batch doubles
+        (80, 80, 100),   # doubling stops at max_queue_size
+        (100, 100, 100),
+        (40, 3, 20),     # partial batch halves
+        (8, 3, 5),       # halving stops at batch_size
+        (5, 0, 5),
+    ])
+    def test_adapt_batch_threshold(self, threshold, drained, expected):
+        """Test that the threshold doubles and halves within its bounds."""
+        bot = _make_bot(BATCH_SIZE=5, MAX_QUEUE_SIZE=100)
+        
+        assert bot._adapt_batch_threshold(threshold, drained) == expected
+    
+    @pytest.mark.asyncio
+    async def test_threshold_decays_while_idle(self):
+        """Test that idle flushes bring a raised threshold back to batch_size."""
+        bot = _make_bot(BATCH_SIZE=5, MAX_QUEUE_SIZE=100)
+        bot._current_batch_threshold = 80
+        bot._current_action_batch_threshold = 80
+        
+        for _ in range(5):
+            await bot._process_message_queue()
+            await bot._process_action_queue()
+        
+        assert bot._current_batch_threshold == 5
+        assert bot._current_action_batch_threshold == 5
+
@@ -4,55 +4,71 @@ Tests for the configuration module.
 
 import pytest
 from unittest.mock import patch
-from badbot_telegram_logger.config import Config, load_config, get_config, reset_config
-import os
+from badbot_telegram_logger.config import Config, load_config, load_config_with_overrides, get_config, reset_config
+
+
+# Anon key shaped like a Supabase JWT
+_FAKE_JWT = "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.eyJpc3MiOiJzdXBhYmFzZSIsInJlZiI6InRlc3QiLCJyb2xlIjoiYW5vbiIsImlhdCI6MTYzNjU2NzIwMCwiZXhwIjoxOTUyMTQzMjAwfQ.test"
+
+# Valid settings shared by the tests; each test copies it and changes only what it checks
+_BASE = {
+    "telegram_token": "1234567890:ABCdefGHIjklMNOpqrsTUVwxyz",
+    "supabase_url": "https://test.supabase.co",
+    "supabase_key": _FAKE_JWT
+}
+
+
+@pytest.fixture(scope="module")
+def base_config_data():
+    """Valid configuration values."""
+    return _BASE
+
+
+@pytest.fixture(scope="module")
+def valid_config(base_config_data):
+    """Config built once from the valid values."""
+    return Config(**base_config_data)
 
 
 class TestConfig:
     """Test cases for the Config class."""
     
-    def test_config_validation(self):
+    def test_config_validation(self, base_config_data, valid_config):
         """Test configuration validation."""
         # Test valid configuration
-        config_data = {
-            "telegram_token": "1234567890:ABCdefGHIjklMNOpqrsTUVwxyz",
-            "supabase_url": "https://test.supabase.co",
-            "supabase_key": "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.eyJpc3MiOiJzdXBhYmFzZSIsInJlZiI6InRlc3QiLCJyb2xlIjoiYW5vbiIsImlhdCI6MTYzNjU2NzIwMCwiZXhwIjoxOTUyMTQzMjAwfQ.test"
-        }
-        
-        config = Config(**config_data)
-        assert config.telegram_token == config_data["telegram_token"]
-        assert config.supabase_url == config_data["supabase_url"]
-        assert config.supabase_key == config_data["supabase_key"]
+        assert valid_config.telegram_token == base_config_data["telegram_token"]
+        assert valid_config.supabase_url == base_config_data["supabase_url"]
+        assert valid_config.supabase_key == base_config_data["supabase_key"]
     
-    def test_invalid_telegram_token(self):
-        """Test invalid Telegram token validation."""
-        config_data = {
-            "telegram_token": "invalid",
-            "supabase_url": "https://test.supabase.co",
-            "supabase_key": "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.eyJpc3MiOiJzdXBhYmFzZSIsInJlZiI6InRlc3QiLCJyb2xlIjoiYW5vbiIsImlhdCI6MTYzNjU2NzIwMCwiZXhwIjoxOTUyMTQzMjAwfQ.test"
-        }
+    @pytest.mark.parametrize("overrides,error", [
+        ({"telegram_token": "invalid"}, "Telegram token appears to be invalid"),
+        ({"supabase_url": "not a url"}, "Supabase URL must start with https:// or http://"),
+    ])
+    def test_invalid_config(self, base_config_data, overrides, error):
+        """Test that an invalid Telegram token or Supabase URL is rejected."""
+        config_data = {**base_config_data, **overrides}
         
-        with pytest.raises(ValueError, match="Telegram token appears to be invalid"):
+        with pytest.raises(ValueError, match=error):
             Config(**config_data)
     
-    def test_invalid_supabase_url(self):
-        """Test invalid Supabase URL validation."""
-        config_data = {
-            "telegram_token": "1234567890:ABCdefGHIjklMNOpqrsTUVwxyz",
-            "supabase_url": "http://invalid.com",
-            "supabase_key": "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.eyJpc3MiOiJzdXBhYmFzZSIsInJlZiI6InRlc3QiLCJyb2xlIjoiYW5vbiIsImlhdCI6MTYzNjU2NzIwMCwiZXhwIjoxOTUyMTQzMjAwfQ.test"
-        }
-        
-        with pytest.raises(ValueError, match="Supabase URL must be in format"):
-            Config(**config_data)
+    @pytest.mark.parametrize("url", [
+        "https://test.supabase.co",
+        "http://localhost:54321",
+        "https://supabase.example.com/",
+    ])
+    def test_supabase_url_accepts_any_host(self, url):
+        """Test that hosted, local and self-hosted Supabase URLs are accepted."""
+        config = Config(
+            logger_telegram_token="1234567890:ABCdefGHIjklMNOpqrsTUVwxyz0123456789",
+            supabase_url=url,
+            supabase_key=_FAKE_JWT
+        )
+        assert config.supabase_url == url
     
-    def test_chat_filtering(self):
+    def test_chat_filtering(self, base_config_data):
         """Test chat filtering functionality."""
         config_data = {
-            "telegram_token": "1234567890:ABCdefGHIjklMNOpqrsTUVwxyz",
-            "supabase_url": "https://test.supabase.co",
-            "supabase_key": "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.eyJpc3MiOiJzdXBhYmFzZSIsInJlZiI6InRlc3QiLCJyb2xlIjoiYW5vbiIsImlhdCI6MTYzNjU2NzIwMCwiZXhwIjoxOTUyMTQzMjAwfQ.test",
+            **base_config_data,
             "allowed_chats": "123,456,789",
             "ignored_chats": "999"
         }
@@ -70,12 +86,10 @@ class TestConfig:
         # Test other chats (should be allowed when no specific allowlist)
         assert config.should_process_chat("111") is True
     
-    def test_channel_filtering(self):
+    def test_channel_filtering(self, base_config_data):
         """Test channel filtering functionality."""
         config_data = {
-            "telegram_token": "1234567890:ABCdefGHIjklMNOpqrsTUVwxyz",
-            "supabase_url": "https://test.supabase.co",
-            "supabase_key": "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.eyJpc3MiOiJzdXBhYmFzZSIsInJlZiI6InRlc3QiLCJyb2xlIjoiYW5vbiIsImlhdCI6MTYzNjU2NzIwMCwiZXhwIjoxOTUyMTQzMjAwfQ.test",
+            **base_config_data,
             "allowed_channels": "channel1,channel2",
             "ignored_channels": "spam_channel"
         }
@@ -92,17 +106,16 @@ class TestConfig:
         # Test other channels (should be allowed when no specific allowlist)
         assert config.should_process_channel("other_channel") is True
 
-    def test_config_loading(self):
+    def test_config_loading(self, monkeypatch):
         """Test that configuration loads correctly from environment variables."""
-        with patch.dict(os.environ, {
-            'logger_telegram_token': 'test_token',
-            'supabase_url': 'https://test.supabase.co',
-            'supabase_key': 'test_key'
-        }):
-            config = Config()
-            assert config.telegram_token == 'test_token'
-            assert config.supabase_url == 'https://test.supabase.co'
-            assert config.supabase_key == 'test_key'
+        monkeypatch.setenv('logger_telegram_token', 'test_token')
+        monkeypatch.setenv('supabase_url', 'https://test.supabase.co')
+        monkeypatch.setenv('supabase_key', 'test_key')
+        
+        config = Config()
+        assert config.telegram_token == 'test_token'
+        assert config.supabase_url == 'https://test.supabase.co'
+        assert config.supabase_key == 'test_key'
 
 
 class TestConfigFunctions:
@@ -112,7 +125,18 @@ class TestConfigFunctions:
         """Reset config before each test."""
         reset_config()
     
-    @patch('badbot_telegram_logger.config.Config')
+    @pytest.fixture
+    def mock_config_class(self):
+        """Patch the Config class used by load_config."""
+        with patch('badbot_telegram_logger.config.Config') as mock:
+            yield mock
+    
+    @pytest.fixture
+    def mock_load_config(self):
+        """Patch load_config as called by get_config."""
+        with patch('badbot_telegram_logger.config.load_config') as mock:
+            yield mock
+    
     def test_load_config(self, mock_config_class):
         """Test load_config function."""
         mock_config = mock_config_class.return_value
@@ -123,7 +147,6 @@ class TestConfigFunctions:
         assert config == mock_config
         mock_config.create_directories.assert_called_once()
     
-    @patch('badbot_telegram_logger.config.load_config')
     def test_get_config(self, mock_load_config):
         """Test get_config function."""
         mock_config = mock_load_config.return_value
@@ -145,4 +168,20 @@ class TestConfigFunctions:
         with patch('badbot_telegram_logger.config._config', 'mock_config'):
             reset_config()
             from badbot_telegram_logger.config import _config
-            assert _config is None 
\ No newline at end of file
+            assert _config is None
+    
+    def test_load_config_with_overrides(self, monkeypatch):
+        """Test that overrides are applied and validated on top of the base config."""
+        monkeypatch.setenv('logger_telegram_token', '1234567890:ABCdefGHIjklMNOpqrsTUVwxyz0123456789')
+        monkeypatch.setenv('supabase_url', 'https://test.supabase.co')
+        monkeypatch.setenv('supabase_key', 'k' * 120)
+        
+        # Drop any base config cached from another environment
+        reset_config()
+        
+        config = load_config_with_overrides(BATCH_SIZE=10, ALLOWED_CHATS="123,456")
+        assert config.batch_size == 10
+        assert config.allowed_chats == frozenset({"123", "456"})
+        
+        with pytest.raises(ValueError, match="greater than or equal to 1"):
+            load_config_with_overrides(BATCH_SIZE=0)
@@ -0,0 +1,263 @@
+"""
+Tests for the database module.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+from postgrest.exceptions import APIError, generate_default_error_message
+from telegram import Chat, Message, User
+
+from badbot_telegram_logger import database
+from badbot_telegram_logger.config import Config
+from badbot_telegram_logger.database import RetryableError, SupabaseManager, _is_retryable
+
+
+# Message conversion still reads the pre-7.0 forward_* attributes
+pytestmark = pytest.mark.filterwarnings("ignore::telegram.warnings.PTBDeprecationWarning")
+
+
+def _make_manager(**overrides) -> SupabaseManager:
+    """Build a SupabaseManager with valid settings and no client connection."""
+    config = Config(
+        logger_telegram_token="1234567890:ABCdefGHIjklMNOpqrsTUVwxyz0123456789",
+        supabase_url="https://test.supabase.co",
+        supabase_key="k" * 120,
+        **overrides
+    )
+    return SupabaseManager(config)
+
+
+def _make_message(message_id: int) -> Message:
+    """Build a minimal text message in a single group chat."""
+    return Message(
+        message_id=message_id,
+        date=datetime.now(timezone.utc),
+        chat=Chat(id=-100123, type="supergroup", title="test"),
+        from_user=User(id=7, first_name="test", is_bot=False),
+        text="hello"
+    )
+
+
+@pytest.fixture
+def manager():
+    """SupabaseManager with default settings."""
+    return _make_manager()
+
+
+class TestIsRetryable:
+    """Test cases for classifying failed database requests."""
+    
+    @pytest.mark.parametrize("status", [502, 503])
+    def test_gateway_error_with_non_json_body(self, status):
+        """Test that gateway errors reported with an int status code are retried."""
+        response = httpx.Response(status, content=b"<html>bad gateway</html>")
+        error = APIError(generate_default_error_message(response))
+        
+        assert error.code == status
+        assert _is_retryable(error) is True
+    
+    @pytest.mark.parametrize("code,expected", [
+        ("PGRST001", True),
+        ("40001", True),
+        ("PGRST202", False),
+        ("23505", False),
+    ])
+    def test_postgrest_and_sqlstate_codes(self, code, expected):
+        """Test that only transient PostgREST and SQLSTATE codes are retried."""
+        error = APIError({"code": code, "message": "error"})
+        
+        assert _is_retryable(error) is expected
+    
+    def test_transport_error(self):
+        """Test that transport failures are retried."""
+        assert _is_retryable(httpx.ConnectError("connection refused")) is True
+
+
+class TestCheckpointFlush:
+    """Test cases for the background checkpoint writer."""
+    
+    @pytest.mark.asyncio
+    async def test_close_during_slow_upsert_keeps_checkpoints(self, manager, monkeypatch):
+        """Test that closing while checkpoints are being written loses no updates."""
+        monkeypatch.setattr(database, "_CHECKPOINT_FLUSH_INTERVAL", 0.01)
+        
+        written = []
+        upsert_started = asyncio.Event()
+        
+        async def slow_upsert(table, rows, on_conflict, operation_name, ignore_duplicates=False):
+            upsert_started.set()
+            await asyncio.sleep(0.2)
+            written.extend(row["checkpoint_id"] for row in rows)
+        
+        monkeypatch.setattr(manager, "_upsert_rows", slow_upsert)
+        
+        await manager.update_checkpoint("message", last_processed_id="1", chat_id=1)
+        await asyncio.wait_for(upsert_started.wait(), timeout=1)
+        
+        # Another update arrives while the first one is still being written
+        await manager.update_checkpoint("message", last_processed_id="2", chat_id=2)
+        
+        await manager.close()
+        
+        assert sorted(written) == ["message_1", "message_2"]
+        assert not manager._pending_checkpoints
+
+
+class TestHealthCheck:
+    """Test cases for the database health check."""
+    
+    @pytest.mark.asyncio
+    async def test_failure_is_not_retried(self, manager):
+        """Test that a transient failure is reported at once instead of retried."""
+        manager._execute = AsyncMock(side_effect=RetryableError("connection refused"))
+        
+        assert await manager.health_check() is False
+        assert manager._execute.await_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_slow_ping_times_out(self):
+        """Test that a hanging ping is reported as unhealthy after the timeout."""
+        manager = _make_manager(HEALTH_CHECK_TIMEOUT=0.05)
+        
+        async def hang(*args, **kwargs):
+            await asyncio.sleep(10)
+        
+        manager._execute = hang
+        
+        assert await asyncio.wait_for(manager.health_check(), timeout=1) is False
+
+
+class TestMessageMicroBatching:
+    """Test cases for batching concurrent single-message stores."""
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_stores_share_one_upsert(self, manager):
+        """Test that concurrent stores are written together and all resolve True."""
+        manager._upsert_rows = AsyncMock()
+        
+        results = await asyncio.gather(*[manager.store_message(_make_message(i)) for i in range(1, 6)])
+        await manager.close()
+        
+        assert results == [True] * 5
+        assert manager._upsert_rows.await_count == 1
+        rows = manager._upsert_rows.await_args.args[1]
+        assert sorted(row["message_id"] for row in rows) == [1, 2, 3, 4, 5]
+    
+    @pytest.mark.asyncio
+    async def test_failed_upsert_fails_every_store(self, manager):
+        """Test that a failed batch resolves every waiting store as False."""
+        manager._upsert_rows = AsyncMock(side_effect=RetryableError("connection refused"))
+        
+        results = await asyncio.gather(*[manager.store_message(_make_message(i)) for i in range(1, 6)])
+        await manager.close()
+        
+        assert results == [False] * 5
+
+
+class _FakePgPool:
+    """Minimal stand-in for an asyncpg pool that records what one connection runs."""
+    
+    def __init__(self):
+        self.connection = MagicMock()
+        self.connection.execute = AsyncMock()
+        self.connection.copy_records_to_table = AsyncMock()
+        
+        @asynccontextmanager
+        async def transaction():
+            yield
+        
+        self.connection.transaction = transaction
+    
+    @asynccontextmanager
+    async def acquire(self, timeout=None):
+        yield self.connection
+
+
+class TestBulkInsertMessages:
+    """Test cases for choosing between COPY and PostgREST for message batches."""
+    
+    def _models(self, manager, count):
+        return [manager._convert_telegram_message(_make_message(i)) for i in range(1, count + 1)]
+    
+    @pytest.mark.asyncio
+    async def test_large_batch_is_copied(self, manager):
+        """Test that a batch over the COPY threshold is copied and skips duplicates."""
+        manager._pg_pool = _FakePgPool()
+        manager._upsert_rows = AsyncMock()
+        count = database._COPY_BATCH_MIN + 1
+        
+        assert await manager.bulk_insert_messages(self._models(manager, count)) == count
+        
+        connection = manager._pg_pool.connection
+        records = connection.copy_records_to_table.await_args.kwargs["records"]
+        assert len(records) == count
+        insert = connection.execute.await_args_list[-1].args[0]
+        assert "ON CONFLICT (message_id, chat_id) DO NOTHING" in insert
+        manager._upsert_rows.assert_not_awaited()
+    
+    @pytest.mark.asyncio
+    async def test_small_batch_is_upserted(self, manager):
+        """Test that a batch at the COPY threshold goes through PostgREST."""
+        manager._pg_pool = _FakePgPool()
+        manager._upsert_rows = AsyncMock()
+        
+        await manager.bulk_insert_messages(self._models(manager, database._COPY_BATCH_MIN))
+        
+        manager._pg_pool.connection.copy_records_to_table.assert_not_awaited()
+        assert manager._upsert_rows.await_args.kwargs["ignore_duplicates"] is True
+    
+    @pytest.mark.asyncio
+    async def test_failed_copy_falls_back_to_upsert(self, manager):
+        """Test that a failed COPY is retried as a PostgREST upsert."""
+        manager._pg_pool = _FakePgPool()
+        manager._pg_pool.connection.copy_records_to_table.side_effect = OSError("connection reset")
+        manager._upsert_rows = AsyncMock()
+        count = database._COPY_BATCH_MIN + 1
+        
+        assert await manager.bulk_insert_messages(self._models(manager, count)) == count
+        assert len(manager._upsert_rows.await_args.args[1]) == count
+
+
+class TestDeleteOlderThan:
+    """Test cases for batched retention cleanup."""
+    
+    @pytest.mark.asyncio
+    async def test_batches_until_short(self, manager, monkeypatch):
+        """Test that cleanup_batch is called until a batch comes back short."""
+        monkeypatch.setattr(database, "_CLEANUP_BATCH_SIZE", 10)
+        batches = iter([10, 10, 3])
+        
+        async def execute(operation, operation_name, *args):
+            assert args[0] == "cleanup_batch"
+            return MagicMock(data=next(batches))
+        
+        manager._execute_with_retry = execute
+        
+        assert await manager._delete_older_than("messages", "date", "2024-01-01T00:00:00Z") == 23
+    
+    @pytest.mark.parametrize("code", ["PGRST202", "42501"])
+    @pytest.mark.asyncio
+    async def test_falls_back_when_function_unavailable(self, manager, code):
+        """Test that a missing or forbidden cleanup_batch falls back to one filtered delete."""
+        manager._tables = {"messages": MagicMock()}
+        calls = []
+        
+        async def execute(operation, operation_name, *args):
+            calls.append(operation)
+            if operation is database._call_function:
+                try:
+                    raise APIError({"code": code, "message": "unavailable"})
+                except APIError as e:
+                    raise database.NonRetryableError("cleanup_batch failed") from e
+            return MagicMock(count=42)
+        
+        manager._execute_with_retry = execute
+        
+        assert await manager._delete_older_than("messages", "date", "2024-01-01T00:00:00Z") == 42
+        assert calls == [database._call_function, database._delete_older_query]
+        assert manager._cleanup_rpc_available is False